@@ -2,16 +2,21 @@
 
 import { useState, useRef, useEffect } from 'react';
 import { Play, Pause, Volume2, VolumeX, RotateCcw } from 'lucide-react';
+import { fetchWaveformPeaks, pickPeakLevel, type WaveformPeaks } from '@/app/lib/waveformPeaks';
 
 interface AudioPlayerProps {
   audioUrl: string;
+  /** Precomputed peaks (generate-waveform-peaks.py); draws a waveform without decoding the clip */
+  peaksUrl?: string;
   videoRef: React.RefObject<HTMLVideoElement | null>;
   autoPlay?: boolean;
   onSyncStatusChange?: (status: string) => void;
 }
 
-export default function AudioPlayer({ audioUrl, videoRef, autoPlay = false, onSyncStatusChange }: AudioPlayerProps) {
+export default function AudioPlayer({ audioUrl, peaksUrl, videoRef, autoPlay = false, onSyncStatusChange }: AudioPlayerProps) {
   const audioRef = useRef<HTMLAudioElement>(null);
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+  const [peaks, setPeaks] = useState<WaveformPeaks | null>(null);
   const [isPlaying, setIsPlaying] = useState(false);
   const [isMuted, setIsMuted] = useState(false);
   const [progress, setProgress] = useState(0);
@@ -138,6 +143,60 @@ export default function AudioPlayer({ audioUrl, videoRef, autoPlay = false, onSy
     };
   }, [autoPlay]);
 
+  useEffect(() => {
+    if (!peaksUrl) {
+      setPeaks(null);
+      return;
+    }
+
+    const controller = new AbortController();
+    fetchWaveformPeaks(peaksUrl, controller.signal)
+      .then(setPeaks)
+      .catch(error => {
+        // Fall back to the plain progress bar
+        if (!controller.signal.aborted) console.warn('Waveform peaks unavailable:', error);
+        setPeaks(null);
+      });
+    return () => controller.abort();
+  }, [peaksUrl]);
+
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    if (!canvas || !peaks) return;
+
+    const ratio = window.devicePixelRatio || 1;
+    const width = Math.max(1, Math.floor(canvas.clientWidth * ratio));
+    const height = Math.max(1, Math.floor(canvas.clientHeight * ratio));
+    if (canvas.width !== width || canvas.height !== height) {
+      canvas.width = width;
+      canvas.height = height;
+    }
+
+    const ctx = canvas.getContext('2d');
+    if (!ctx) return;
+
+    const level = pickPeakLevel(peaks, width);
+    const peakCount = level.peaks.length / 2;
+    const playedX = (progress / 100) * width;
+    const mid = height / 2;
+    const scale = mid / 127;
+
+    ctx.clearRect(0, 0, width, height);
+    for (let x = 0; x < width; x++) {
+      // Each pixel covers one or more peaks; take their overall min/max
+      const start = Math.floor((x / width) * peakCount);
+      const end = Math.max(start + 1, Math.floor(((x + 1) / width) * peakCount));
+      let min = 0;
+      let max = 0;
+      for (let i = start; i < end && i < peakCount; i++) {
+        min = Math.min(min, level.peaks[i * 2]);
+        max = Math.max(max, level.peaks[i * 2 + 1]);
+      }
+      ctx.fillStyle = x < playedX ? '#2563eb' : '#d1d5db';
+      ctx.fillRect(x, mid - max * scale, 1, Math.max(1, (max - min) * scale));
+    }
+  }, [peaks, progress]);
+
   const togglePlay = async () => {
     const audio = audioRef.current;
     const video = videoRef.current;
@@ -223,16 +282,25 @@ export default function AudioPlayer({ audioUrl, videoRef, autoPlay = false, onSy
         </div>
       </div>
 
-      {/* Progress Bar */}
-      <div 
-        className="h-2 bg-gray-200 rounded-full mb-4 cursor-pointer relative"
-        onClick={handleProgressClick}
-      >
+      {/* Progress Bar (waveform when peaks are available) */}
+      {peaks ? (
+        <div
+          className="h-12 mb-4 cursor-pointer relative"
+          onClick={handleProgressClick}
+        >
+          <canvas ref={canvasRef} className="w-full h-full" />
+        </div>
+      ) : (
         <div 
-          className="h-full bg-blue-600 rounded-full transition-all duration-100"
-          style={{ width: `${progress}%` }}
-        />
-      </div>
+          className="h-2 bg-gray-200 rounded-full mb-4 cursor-pointer relative"
+          onClick={handleProgressClick}
+        >
+          <div 
+            className="h-full bg-blue-600 rounded-full transition-all duration-100"
+            style={{ width: `${progress}%` }}
+          />
+        </div>
+      )}
 
       {/* Controls */}
       <div className="flex items-center justify-between">
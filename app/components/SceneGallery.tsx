@@ -1,37 +1,67 @@
 'use client';
 
-import { useState, useRef } from 'react';
-import scenes from '../../data/scenes.json';
+import { useState, useRef, useEffect } from 'react';
 import AudioPlayer from './AudioPlayer';
 import VideoPlayer from './VideoPlayer';
 import VideoStill from './VideoStill';
+import { fetchSceneDetail, fetchSceneIndex, type SceneSummary } from '../lib/sceneManifest';
 import { ChevronLeft, ChevronRight, Sparkles } from 'lucide-react';
 
-type Scene = typeof scenes.scenes[0];
+// Type only: scene data is fetched from the sharded manifest, not bundled
+type Scene = typeof import('../../data/scenes.json')['scenes'][number];
 
 export default function SceneGallery() {
+  const [sceneIndex, setSceneIndex] = useState<SceneSummary[]>([]);
+  const [loadError, setLoadError] = useState<string | null>(null);
   const [selectedScene, setSelectedScene] = useState<Scene | null>(null);
   const [currentSceneIndex, setCurrentSceneIndex] = useState(0);
   const [showMagic, setShowMagic] = useState(false);
   const [syncStatus, setSyncStatus] = useState('Ready for transformation');
   const videoRef = useRef<HTMLVideoElement>(null);
+  // Index of the scene most recently asked for; older detail responses are ignored
+  const requestedIndex = useRef<number | null>(null);
+
+  // Only the small index is loaded up front; each scene's shard loads when opened
+  useEffect(() => {
+    fetchSceneIndex()
+      .then((index) => setSceneIndex(index.scenes))
+      .catch((error: Error) => setLoadError(error.message));
+  }, []);
+
+  const sceneCount = sceneIndex.length;
 
   const nextScene = () => {
-    setCurrentSceneIndex((prev) => (prev + 1) % scenes.scenes.length);
+    if (sceneCount === 0) return;
+    setCurrentSceneIndex((prev) => (prev + 1) % sceneCount);
   };
 
   const prevScene = () => {
-    setCurrentSceneIndex((prev) => (prev - 1 + scenes.scenes.length) % scenes.scenes.length);
+    if (sceneCount === 0) return;
+    setCurrentSceneIndex((prev) => (prev - 1 + sceneCount) % sceneCount);
   };
 
-  const openScene = (scene: Scene, index: number) => {
-    setSelectedScene(scene);
+  const showScene = (index: number) => {
+    const summary = sceneIndex[index];
+    if (!summary) return;
     setCurrentSceneIndex(index);
+    requestedIndex.current = index;
+    fetchSceneDetail<Scene>(summary)
+      .then((scene) => {
+        if (requestedIndex.current === index) setSelectedScene(scene);
+      })
+      .catch((error: Error) => {
+        if (requestedIndex.current === index) setLoadError(error.message);
+      });
+  };
+
+  const openScene = (index: number) => {
+    showScene(index);
     setShowMagic(false);
     setSyncStatus('Ready for transformation');
   };
 
   const closeModal = () => {
+    requestedIndex.current = null;
     setSelectedScene(null);
     setShowMagic(false);
     setSyncStatus('Ready for transformation');
@@ -49,32 +79,42 @@ export default function SceneGallery() {
 
   return (
     <div className="max-w-7xl mx-auto">
+      {loadError && (
+        <p className="text-center text-red-600 mb-4">Could not load scenes: {loadError}</p>
+      )}
+
       {/* Single Row Scene Gallery */}
       <div className="relative">
         {/* Navigation Arrows */}
         <button
           onClick={prevScene}
-          className="absolute left-0 top-1/2 transform -translate-y-1/2 -translate-x-4 bg-white border border-gray-300 rounded-full p-2 shadow-lg hover:shadow-xl transition-all z-10"
+          disabled={sceneCount === 0}
+          className="absolute left-0 top-1/2 transform -translate-y-1/2 -translate-x-4 bg-white border border-gray-300 rounded-full p-2 shadow-lg hover:shadow-xl transition-all z-10 disabled:opacity-40 disabled:cursor-not-allowed"
         >
           <ChevronLeft size={24} className="text-gray-600" />
         </button>
 
         <button
           onClick={nextScene}
-          className="absolute right-0 top-1/2 transform -translate-y-1/2 translate-x-4 bg-white border border-gray-300 rounded-full p-2 shadow-lg hover:shadow-xl transition-all z-10"
+          disabled={sceneCount === 0}
+          className="absolute right-0 top-1/2 transform -translate-y-1/2 translate-x-4 bg-white border border-gray-300 rounded-full p-2 shadow-lg hover:shadow-xl transition-all z-10 disabled:opacity-40 disabled:cursor-not-allowed"
         >
           <ChevronRight size={24} className="text-gray-600" />
         </button>
 
         {/* Scene Cards Row */}
         <div className="flex space-x-6 overflow-x-auto pb-4 px-2 scrollbar-hide">
-          {scenes.scenes.map((scene, index) => (
+          {sceneIndex.map((scene, index) => (
             <div 
               key={scene.id}
               className="flex-none w-80 border border-gray-200 rounded-lg overflow-hidden hover:shadow-lg transition-all duration-300 cursor-pointer bg-white"
-              onClick={() => openScene(scene, index)}
+              onClick={() => openScene(index)}
             >
-              <VideoStill category={scene.category} />
+              <VideoStill
+                category={scene.category ?? ''}
+                preview={scene.preview}
+                alt={scene.title}
+              />
               
               <div className="p-4">
                 <div className="flex items-center justify-between mb-3">
@@ -108,7 +148,7 @@ export default function SceneGallery() {
 
         {/* Scene Indicator Dots */}
         <div className="flex justify-center space-x-2 mt-6">
-          {scenes.scenes.map((_, index) => (
+          {sceneIndex.map((_, index) => (
             <button
               key={index}
               onClick={() => setCurrentSceneIndex(index)}
@@ -136,26 +176,20 @@ export default function SceneGallery() {
                   <div className="flex items-center space-x-2">
                     <button
                       onClick={() => {
-                        const prevIndex = (currentSceneIndex - 1 + scenes.scenes.length) % scenes.scenes.length;
-                        setSelectedScene(scenes.scenes[prevIndex]);
-                        setCurrentSceneIndex(prevIndex);
-                        setShowMagic(false);
-                        setSyncStatus('Ready for transformation');
+                        const prevIndex = (currentSceneIndex - 1 + sceneCount) % sceneCount;
+                        openScene(prevIndex);
                       }}
                       className="p-2 border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors"
                     >
                       <ChevronLeft size={16} />
                     </button>
                     <span className="text-sm text-gray-600">
-                      {currentSceneIndex + 1} of {scenes.scenes.length}
+                      {currentSceneIndex + 1} of {sceneCount}
                     </span>
                     <button
                       onClick={() => {
-                        const nextIndex = (currentSceneIndex + 1) % scenes.scenes.length;
-                        setSelectedScene(scenes.scenes[nextIndex]);
-                        setCurrentSceneIndex(nextIndex);
-                        setShowMagic(false);
-                        setSyncStatus('Ready for transformation');
+                        const nextIndex = (currentSceneIndex + 1) % sceneCount;
+                        openScene(nextIndex);
                       }}
                       className="p-2 border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors"
                     >
@@ -204,6 +238,7 @@ export default function SceneGallery() {
                   {showMagic && selectedScene.ourSolution.audioUrl && (
                     <AudioPlayer 
                       audioUrl={selectedScene.ourSolution.audioUrl}
+                      peaksUrl={(selectedScene.ourSolution as { peaksUrl?: string }).peaksUrl}
                       videoRef={videoRef}
                       autoPlay={true}
                       onSyncStatusChange={setSyncStatus}
@@ -1,11 +1,36 @@
 'use client';
 
+interface PreviewRendition {
+  url: string;
+  width: number;
+}
+
+// Written into the scene manifests by build-preview-images.py
+export interface PreviewImage {
+  width: number;
+  height: number;
+  hash: string;
+  sources: {
+    avif?: PreviewRendition[];
+    webp?: PreviewRendition[];
+    jpeg: PreviewRendition[];
+  };
+}
+
 interface VideoStillProps {
   category: string;
   className?: string;
+  preview?: PreviewImage;
+  alt?: string;
 }
 
-export default function VideoStill({ category, className = '' }: VideoStillProps) {
+// Gallery cards are a fixed w-80 (320px); the browser scales up for high-DPI screens
+const PREVIEW_SIZES = '320px';
+
+const toSrcSet = (renditions: PreviewRendition[]) =>
+  renditions.map(({ url, width }) => `${url} ${width}w`).join(', ');
+
+export default function VideoStill({ category, className = '', preview, alt = '' }: VideoStillProps) {
   // Color gradients based on category
   const getGradient = (cat: string) => {
     const gradients = {
@@ -41,6 +66,29 @@ export default function VideoStill({ category, className = '' }: VideoStillProps
         <div className="w-full h-full bg-grid-white/[0.2]"></div>
       </div>
       
+      {/* Preview frame; width/height reserve its box so nothing shifts on load */}
+      {preview && preview.sources.jpeg.length > 0 && (
+        <picture>
+          {preview.sources.avif && (
+            <source type="image/avif" srcSet={toSrcSet(preview.sources.avif)} sizes={PREVIEW_SIZES} />
+          )}
+          {preview.sources.webp && (
+            <source type="image/webp" srcSet={toSrcSet(preview.sources.webp)} sizes={PREVIEW_SIZES} />
+          )}
+          <img
+            src={preview.sources.jpeg[Math.floor((preview.sources.jpeg.length - 1) / 2)].url}
+            srcSet={toSrcSet(preview.sources.jpeg)}
+            sizes={PREVIEW_SIZES}
+            width={preview.width}
+            height={preview.height}
+            alt={alt}
+            loading="lazy"
+            decoding="async"
+            className="absolute inset-0 w-full h-full object-cover"
+          />
+        </picture>
+      )}
+
       {/* Content */}
       <div className="text-center z-10">
         <div className="text-3xl mb-2">{getIcon(category)}</div>
@@ -0,0 +1,53 @@
+/**
+ * Client for the sharded scene manifest built by
+ * audio-generation/audio-generation/build-scene-manifest.py
+ *
+ * The index is small and fetched up front; per-scene details are fetched on
+ * demand. Shard URLs carry a content hash, so a fetched shard never changes
+ * and can be cached for the lifetime of the page.
+ */
+
+import type { PreviewImage } from "../components/VideoStill";
+
+export const SCENE_INDEX_URL = "/data/scenes/index.json";
+
+export type SceneSummary = {
+  id: string;
+  title: string;
+  category?: string;
+  imageUrl?: string;
+  preview?: PreviewImage;
+  audioHash: string | null;
+  detailUrl: string;
+};
+
+export type SceneIndex = {
+  version: number;
+  scenes: SceneSummary[];
+};
+
+const detailCache = new Map<string, Promise<unknown>>();
+
+export async function fetchSceneIndex(url = SCENE_INDEX_URL): Promise<SceneIndex> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load scene index (${response.status})`);
+  }
+  return (await response.json()) as SceneIndex;
+}
+
+export function fetchSceneDetail<T = unknown>(summary: SceneSummary): Promise<T> {
+  let pending = detailCache.get(summary.detailUrl);
+  if (!pending) {
+    pending = fetch(summary.detailUrl, { cache: "force-cache" }).then((response) => {
+      if (!response.ok) {
+        throw new Error(`Failed to load scene ${summary.id} (${response.status})`);
+      }
+      return response.json();
+    });
+    // Let a failed request be retried
+    pending.catch(() => detailCache.delete(summary.detailUrl));
+    detailCache.set(summary.detailUrl, pending);
+  }
+  return pending as Promise<T>;
+}
@@ -0,0 +1,55 @@
+/**
+ * Reader for the precomputed waveform peaks written by
+ * audio-generation/audio-generation/generate-waveform-peaks.py
+ */
+
+export type PeakLevel = {
+  samplesPerPeak: number;
+  /** Interleaved (min, max) pairs scaled to ±127 */
+  peaks: Int8Array;
+};
+
+export type WaveformPeaks = {
+  sampleRate: number;
+  totalSamples: number;
+  levels: PeakLevel[];
+};
+
+const MAGIC = "VNPK";
+
+export function parseWaveformPeaks(buffer: ArrayBuffer): WaveformPeaks {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== MAGIC) {
+    throw new Error("Not a waveform peaks file");
+  }
+
+  const levelCount = view.getUint16(6, true);
+  const sampleRate = view.getUint32(8, true);
+  const totalSamples = view.getUint32(12, true);
+
+  let offset = 16 + levelCount * 8;
+  const levels: PeakLevel[] = [];
+  for (let i = 0; i < levelCount; i++) {
+    const samplesPerPeak = view.getUint32(16 + i * 8, true);
+    const peakCount = view.getUint32(20 + i * 8, true);
+    levels.push({ samplesPerPeak, peaks: new Int8Array(buffer, offset, peakCount * 2) });
+    offset += peakCount * 2;
+  }
+
+  return { sampleRate, totalSamples, levels };
+}
+
+/** Coarsest level that still has at least one peak per pixel */
+export function pickPeakLevel(data: WaveformPeaks, width: number): PeakLevel {
+  const byDetail = [...data.levels].sort((a, b) => b.samplesPerPeak - a.samplesPerPeak);
+  return byDetail.find((level) => level.peaks.length / 2 >= width) ?? byDetail[byDetail.length - 1];
+}
+
+export async function fetchWaveformPeaks(url: string, signal?: AbortSignal) {
+  const response = await fetch(url, { signal });
+  if (!response.ok) {
+    throw new Error(`Failed to load waveform peaks (${response.status})`);
+  }
+  return parseWaveformPeaks(await response.arrayBuffer());
+}
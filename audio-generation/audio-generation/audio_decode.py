@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Decode narration clips to float32 PCM with ffmpeg.
+
+Our "*.wav" files are really MP3s from ElevenLabs, so we let ffmpeg handle
+whatever container turns up and read raw samples back through a pipe.
+"""
+import shutil
+import subprocess
+
+import numpy as np
+
+DEFAULT_SAMPLE_RATE = 44100
+
+
+def ffmpeg_binary():
+    binary = shutil.which("ffmpeg")
+    if not binary:
+        raise RuntimeError("ffmpeg is required to decode audio (apt install ffmpeg / brew install ffmpeg)")
+    return binary
+
+
+def _decode_command(path, sample_rate, channels):
+    return [
+        ffmpeg_binary(), "-v", "error", "-nostdin",
+        "-i", str(path),
+        "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(channels), "-ar", str(sample_rate),
+        "pipe:1",
+    ]
+
+
+def decode_pcm(path, sample_rate=DEFAULT_SAMPLE_RATE, channels=1):
+    """Decode a whole clip; returns float32 samples shaped (frames, channels)"""
+    result = subprocess.run(_decode_command(path, sample_rate, channels), capture_output=True, check=True)
+    samples = np.frombuffer(result.stdout, dtype="<f4")
+    return samples.reshape(-1, channels)
+
+
+def stream_pcm(path, sample_rate=DEFAULT_SAMPLE_RATE, channels=1, chunk_frames=65536):
+    """Yield (frames, channels) float32 chunks without holding the whole clip"""
+    chunk_bytes = chunk_frames * channels * 4
+    process = subprocess.Popen(_decode_command(path, sample_rate, channels),
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    finished = False
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            usable = len(data) - len(data) % (channels * 4)
+            yield np.frombuffer(data[:usable], dtype="<f4").reshape(-1, channels)
+        finished = True
+    finally:
+        if not finished:
+            # Consumer stopped early (or errored); don't wait on a blocked ffmpeg
+            process.kill()
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        if process.wait() != 0 and finished:
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {stderr.decode(errors='replace').strip()}")
+
+
+def open_encoder(path, sample_rate=DEFAULT_SAMPLE_RATE, channels=1):
+    """ffmpeg process that encodes float32 PCM written to its stdin; format follows the extension"""
+    return subprocess.Popen([
+        ffmpeg_binary(), "-v", "error", "-nostdin", "-y",
+        "-f", "f32le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+        str(path),
+    ], stdin=subprocess.PIPE)
+
+
+def probe_duration(path):
+    """Clip length in seconds from the container, without decoding it"""
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        raise RuntimeError("ffprobe is required (it ships with ffmpeg)")
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+        capture_output=True, check=True
+    )
+    return float(result.stdout.strip())
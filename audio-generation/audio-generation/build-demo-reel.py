@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Stitch the scene narration clips into one demo reel.
+
+Clips are streamed through ffmpeg chunk by chunk: decoded, gain-matched,
+crossfaded or separated by silence, mixed over an optional looping
+background bed and piped straight into the encoder. Only the current chunk
+and the crossfade tail are ever held in memory, so a one-hour reel uses
+the same memory as a one-minute one.
+
+Usage:
+    python build-demo-reel.py --output reel.mp3
+    python build-demo-reel.py --gap 1.5 --bed ambience.mp3 --bed-gain -20 --output reel.mp3
+    python build-demo-reel.py --spec reel.json --output reel.wav
+
+A spec file lists scenes in reel order; gap/crossfade describe the
+transition into that scene and override the command-line defaults:
+    {"scenes": [{"id": "matrix-lobby"}, {"id": "inception-folding", "crossfade": 0.8},
+                {"id": "avatar-flight", "gap": 2.0, "gain_db": -1.5}]}
+"""
+import argparse
+import json
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+import audio_decode
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PUBLIC_DIR = REPO_ROOT / "public"
+DEFAULT_MANIFEST = REPO_ROOT / "data" / "scenes-with-audio.json"
+
+SAMPLE_RATE = 44100
+CHUNK_FRAMES = 65536
+LOUDNESS_BLOCK_SECONDS = 0.4
+LOUDNESS_GATE_DB = -70.0
+MAX_GAIN_DB = 12.0
+
+
+@dataclass
+class ReelItem:
+    scene_id: str
+    path: Path
+    gap: float
+    crossfade: float
+    gain_db: float = None
+
+
+def db_to_gain(db):
+    return 10 ** (db / 20)
+
+
+def mono_chunks(path):
+    for chunk in audio_decode.stream_pcm(path, SAMPLE_RATE, channels=1, chunk_frames=CHUNK_FRAMES):
+        yield chunk[:, 0]
+
+
+def measure_loudness(path):
+    """Gated RMS loudness in dBFS over 400ms blocks, computed while streaming"""
+    block = int(LOUDNESS_BLOCK_SECONDS * SAMPLE_RATE)
+    gate = 10 ** (LOUDNESS_GATE_DB / 10)
+    energy = 0.0
+    blocks = 0
+    carry = np.zeros(0, dtype=np.float32)
+    for chunk in mono_chunks(path):
+        data = np.concatenate([carry, chunk])
+        usable = len(data) - len(data) % block
+        if usable:
+            power = np.square(data[:usable].reshape(-1, block), dtype=np.float64).mean(axis=1)
+            kept = power[power > gate]
+            energy += kept.sum()
+            blocks += len(kept)
+        carry = data[usable:]
+    if not blocks:
+        return None
+    return 10 * math.log10(energy / blocks)
+
+
+class BedSource:
+    """Loops a background clip forever, handing out exactly n samples at a time"""
+
+    def __init__(self, path, gain_db):
+        self.path = path
+        self.gain = db_to_gain(gain_db)
+        self._chunks = None
+        self._pass_empty = True
+        self._buffer = np.zeros(0, dtype=np.float32)
+
+    def read(self, n):
+        parts = [self._buffer]
+        have = len(self._buffer)
+        while have < n:
+            if self._chunks is None:
+                self._chunks = mono_chunks(self.path)
+                self._pass_empty = True
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                if self._pass_empty:
+                    raise RuntimeError(f"Background bed {self.path} decoded to no audio")
+                self._chunks = None
+                continue
+            self._pass_empty = False
+            parts.append(chunk)
+            have += len(chunk)
+        data = np.concatenate(parts)
+        self._buffer = data[n:]
+        return data[:n] * self.gain
+
+
+class ReelWriter:
+    def __init__(self, output, bed=None):
+        self.encoder = audio_decode.open_encoder(output, SAMPLE_RATE, channels=1)
+        self.bed = bed
+        self.frames_written = 0
+
+    def write(self, samples):
+        if not len(samples):
+            return
+        if self.bed is not None:
+            samples = samples + self.bed.read(len(samples))
+        np.clip(samples, -1.0, 1.0, out=samples)
+        self.encoder.stdin.write(samples.astype("<f4").tobytes())
+        self.frames_written += len(samples)
+
+    def write_silence(self, seconds):
+        remaining = int(round(seconds * SAMPLE_RATE))
+        while remaining > 0:
+            n = min(remaining, CHUNK_FRAMES)
+            self.write(np.zeros(n, dtype=np.float32))
+            remaining -= n
+
+    def close(self):
+        self.encoder.stdin.close()
+        if self.encoder.wait() != 0:
+            raise RuntimeError("ffmpeg failed to encode the reel")
+
+
+def equal_power_crossfade(tail, head):
+    """Fade the previous clip's tail out while the next clip's head fades in"""
+    length = max(len(tail), len(head))
+    t = (np.arange(length, dtype=np.float32) + 0.5) / length
+    out = np.zeros(length, dtype=np.float32)
+    out[:len(tail)] += tail * np.cos(t[:len(tail)] * np.pi / 2)
+    out[:len(head)] += head * np.sin(t[:len(head)] * np.pi / 2)
+    return out
+
+
+def render(items, writer, target_db):
+    tail = np.zeros(0, dtype=np.float32)
+    for index, item in enumerate(items):
+        loudness = measure_loudness(item.path)
+        if item.gain_db is not None:
+            gain_db = item.gain_db
+        elif loudness is None or target_db is None:
+            gain_db = 0.0
+        else:
+            gain_db = min(MAX_GAIN_DB, target_db - loudness)
+        gain = db_to_gain(gain_db)
+
+        # Hold back enough of this clip to crossfade into the next one
+        next_item = items[index + 1] if index + 1 < len(items) else None
+        hold = int(next_item.crossfade * SAMPLE_RATE) if next_item else 0
+        fade_in = len(tail)
+
+        pending = np.zeros(0, dtype=np.float32)
+        for chunk in mono_chunks(item.path):
+            chunk = chunk * gain
+            if fade_in:
+                missing = fade_in - len(pending)
+                head, chunk = chunk[:missing], chunk[missing:]
+                pending = np.concatenate([pending, head])
+                if len(pending) < fade_in:
+                    continue
+                writer.write(equal_power_crossfade(tail, pending))
+                pending = np.zeros(0, dtype=np.float32)
+                fade_in = 0
+                tail = np.zeros(0, dtype=np.float32)
+            pending = np.concatenate([pending, chunk])
+            if len(pending) > hold:
+                writer.write(pending[:len(pending) - hold])
+                pending = pending[len(pending) - hold:]
+
+        if fade_in:
+            # Clip was shorter than the crossfade; blend what we got
+            pending = equal_power_crossfade(tail, pending)
+            if len(pending) > hold:
+                writer.write(pending[:len(pending) - hold])
+                pending = pending[len(pending) - hold:]
+        tail = pending
+
+        print(f"   🎞️  {item.scene_id:24} gain {gain_db:+5.1f} dB"
+              + (f"  (measured {loudness:.1f} dBFS)" if loudness is not None else ""))
+
+        if next_item and next_item.crossfade <= 0:
+            writer.write(tail)
+            tail = np.zeros(0, dtype=np.float32)
+            writer.write_silence(next_item.gap)
+    writer.write(tail)
+
+
+def resolve_items(manifest_path, spec_path, gap, crossfade):
+    with open(manifest_path, 'r') as f:
+        scenes = {scene["id"]: scene for scene in json.load(f)["scenes"]}
+
+    if spec_path:
+        with open(spec_path, 'r') as f:
+            entries = json.load(f)["scenes"]
+    else:
+        entries = [{"id": scene_id} for scene_id in scenes]
+
+    items = []
+    for entry in entries:
+        scene = scenes[entry["id"]]
+        audio_url = scene["ourSolution"]["audioUrl"]
+        items.append(ReelItem(
+            scene_id=entry["id"],
+            path=PUBLIC_DIR / audio_url.lstrip("/"),
+            gap=entry.get("gap", gap),
+            crossfade=entry.get("crossfade", crossfade),
+            gain_db=entry.get("gain_db"),
+        ))
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a narration demo reel from the scene clips")
+    parser.add_argument("--output", required=True, help="Output file; format follows the extension")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--spec", type=Path, help="Reel spec JSON (scene order and per-scene transitions)")
+    parser.add_argument("--gap", type=float, default=1.0, help="Silence between scenes, seconds")
+    parser.add_argument("--crossfade", type=float, default=0.0,
+                        help="Crossfade between scenes, seconds (replaces the gap)")
+    parser.add_argument("--target-db", type=float, default=-20.0,
+                        help="Loudness every clip is matched to, dBFS (gated RMS)")
+    parser.add_argument("--no-loudness-match", action="store_true")
+    parser.add_argument("--bed", type=Path, help="Background bed, looped under the whole reel")
+    parser.add_argument("--bed-gain", type=float, default=-22.0, help="Bed level, dB")
+    args = parser.parse_args()
+
+    items = resolve_items(args.manifest, args.spec, args.gap, args.crossfade)
+    bed = BedSource(args.bed, args.bed_gain) if args.bed else None
+    target_db = None if args.no_loudness_match else args.target_db
+
+    print(f"🎬 Building demo reel from {len(items)} scenes")
+    print("─" * 70)
+
+    started = time.perf_counter()
+    writer = ReelWriter(args.output, bed)
+    try:
+        render(items, writer, target_db)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    duration = writer.frames_written / SAMPLE_RATE
+    print(f"\n✅ Wrote {args.output}: {duration:.1f}s of audio in {elapsed:.1f}s "
+          f"({duration / elapsed:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Render responsive preview images for every scene.
+
+The source for each scene is its first extracted keyframe
+(extract-keyframes.py), falling back to a frame grabbed from the video.
+Each source is resized to several widths and encoded as AVIF, WebP and a
+JPEG fallback; the work is spread over a process pool, one task per
+(scene, width). Output names carry a hash of the source image and the
+encode settings, so unchanged previews are skipped on the next build.
+
+The scene manifests get ``imageUrl`` (the default-width JPEG) plus a
+``preview`` block with the intrinsic size and every rendition, which
+VideoStill uses to emit a <picture> with srcset and width/height.
+
+Usage:
+    python extract-keyframes.py && python build-preview-images.py
+    python build-preview-images.py --widths 320 640 --workers 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, features
+
+import audio_decode
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PUBLIC_DIR = REPO_ROOT / "public"
+DEFAULT_MANIFESTS = [REPO_ROOT / "data" / "scenes.json", REPO_ROOT / "data" / "scenes-with-audio.json"]
+DEFAULT_OUTPUT = PUBLIC_DIR / "images" / "previews"
+
+DEFAULT_WIDTHS = (320, 640, 960, 1280)
+DEFAULT_IMAGE_WIDTH = 640
+FALLBACK_GRAB_SECONDS = 1.0
+
+# <scene id>-<source hash>-<width>.<ext>; ids may themselves contain dashes
+RENDITION_NAME = re.compile(r"(?P<scene_id>.+)-[0-9a-f]{10}-\d+\.(?:avif|webp|jpg)")
+
+# Quality settings are part of the cache key so changing them re-renders
+ENCODERS = {
+    "avif": {"format": "AVIF", "quality": 50, "speed": 6},
+    "webp": {"format": "WEBP", "quality": 78, "method": 6},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+def available_formats():
+    formats = ["jpeg"]
+    if features.check("webp"):
+        formats.insert(0, "webp")
+    if "avif" in features.modules and features.check("avif"):
+        formats.insert(0, "avif")
+    return formats
+
+
+def source_for(scene, keyframes_dir, scratch_dir):
+    """First keyframe if we have one, else a frame grabbed from the video"""
+    index_file = keyframes_dir / scene["id"] / "keyframes.json"
+    if index_file.exists():
+        with open(index_file, 'r') as f:
+            keyframes = json.load(f)["keyframes"]
+        if keyframes:
+            return keyframes_dir / scene["id"] / keyframes[0]["file"]
+
+    video = PUBLIC_DIR / scene["videoUrl"].lstrip("/")
+    grab = Path(scratch_dir) / f"{scene['id']}.png"
+    subprocess.run(
+        [audio_decode.ffmpeg_binary(), "-v", "error", "-nostdin", "-y", "-ss", str(FALLBACK_GRAB_SECONDS),
+         "-i", str(video), "-frames:v", "1", str(grab)],
+        check=True
+    )
+    return grab
+
+
+def source_hash(path, formats):
+    digest = hashlib.sha256(Path(path).read_bytes())
+    digest.update(json.dumps({f: ENCODERS[f] for f in formats}, sort_keys=True).encode())
+    return digest.hexdigest()[:10]
+
+
+def render_width(source, width, outputs):
+    """Resize once and encode every format; runs in a worker process"""
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        if width < image.width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        for fmt, output in outputs.items():
+            options = dict(ENCODERS[fmt])
+            tmp = Path(output).with_suffix(Path(output).suffix + ".tmp")
+            image.save(tmp, options.pop("format"), **options)
+            os.replace(tmp, output)
+        return image.width, image.height
+
+
+def plan_scene(scene, source, output_dir, widths, formats):
+    """Work still to do for one scene, plus its manifest entry"""
+    digest = source_hash(source, formats)
+    with Image.open(source) as image:
+        src_width, src_height = image.size
+
+    # Never upscale; always include the source width if it is below the smallest target
+    targets = sorted({w for w in widths if w <= src_width} or {src_width})
+    prefix = "/" + output_dir.relative_to(PUBLIC_DIR).as_posix()
+
+    tasks = []
+    sources = {fmt: [] for fmt in formats}
+    for width in targets:
+        outputs = {}
+        for fmt in formats:
+            name = f"{scene['id']}-{digest}-{width}.{'jpg' if fmt == 'jpeg' else fmt}"
+            sources[fmt].append({"url": f"{prefix}/{name}", "width": width})
+            if not (output_dir / name).exists():
+                outputs[fmt] = str(output_dir / name)
+        if outputs:
+            tasks.append((scene["id"], str(source), width, outputs))
+
+    default = min(targets, key=lambda w: abs(w - DEFAULT_IMAGE_WIDTH))
+    preview = {
+        "width": src_width,
+        "height": src_height,
+        "hash": digest,
+        "sources": sources,
+    }
+    image_url = next(s["url"] for s in sources["jpeg"] if s["width"] == default)
+    return tasks, image_url, preview
+
+
+def update_manifest(manifest_path, entries):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    for scene in manifest["scenes"]:
+        if scene["id"] in entries:
+            scene["imageUrl"], scene["preview"] = entries[scene["id"]]
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def prune(output_dir, entries):
+    """Remove renditions left over from earlier sources"""
+    keep = {
+        Path(source["url"]).name
+        for _, preview in entries.values()
+        for renditions in preview["sources"].values()
+        for source in renditions
+    }
+    for path in output_dir.iterdir():
+        match = RENDITION_NAME.fullmatch(path.name)
+        if match and match["scene_id"] in entries and path.name not in keep:
+            path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive scene preview images")
+    parser.add_argument("--manifest", action="append", type=Path,
+                        help="Scene manifest(s) to read and update (default: data/scenes.json and data/scenes-with-audio.json)")
+    parser.add_argument("--keyframes", type=Path, default=Path("keyframes"))
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    manifests = args.manifest or DEFAULT_MANIFESTS
+    output_dir = args.output.resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    formats = available_formats()
+    with open(manifests[0], 'r') as f:
+        scenes = json.load(f)["scenes"]
+
+    print(f"🖼️  Building previews ({', '.join(formats)}) at widths {args.widths}")
+    print("─" * 70)
+    if "avif" not in formats:
+        print("   ⚠️  This Pillow build has no AVIF encoder; writing WebP + JPEG only")
+
+    entries = {}
+    tasks = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for scene in scenes:
+            try:
+                source = source_for(scene, args.keyframes, scratch)
+                scene_tasks, image_url, preview = plan_scene(scene, source, output_dir, args.widths, formats)
+            except Exception as e:
+                print(f"   ❌ {scene['id']}: {e}")
+                continue
+            entries[scene["id"]] = (image_url, preview)
+            tasks.extend(scene_tasks)
+            status = f"{len(scene_tasks)} widths to render" if scene_tasks else "cached"
+            print(f"   • {scene['id']:24} {preview['width']}x{preview['height']}  {status}")
+
+        if tasks:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                futures = {pool.submit(render_width, *task[1:]): task for task in tasks}
+                for future in as_completed(futures):
+                    scene_id, source, width, outputs = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Leave this scene's manifest entry as it was
+                        print(f"   ❌ {scene_id} @ {width}px: {e}")
+                        entries.pop(scene_id, None)
+
+    prune(output_dir, entries)
+    total = sum(p.stat().st_size for p in output_dir.iterdir() if p.is_file())
+    print(f"\n✅ Rendered {len(tasks)} scene/width tasks; {total / 1024:.0f} KB of previews in {output_dir}")
+
+    for manifest_path in manifests:
+        update_manifest(manifest_path, entries)
+        print(f"📝 Updated {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
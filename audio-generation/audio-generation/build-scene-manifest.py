@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Compile the scene sources into a small index plus per-scene shards.
+
+The gallery only needs id/title/thumbnail to render cards, so that goes in
+public/data/scenes/index.json. Everything else (competitor captions,
+metrics, audio metadata) lives in one content-hashed shard per scene that
+the front end fetches when a scene is opened. Every file is minified and
+written alongside .gz and .br copies; brotli is skipped if the ``brotli``
+package is not installed.
+
+Usage:
+    python build-scene-manifest.py
+"""
+import argparse
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PUBLIC_DIR = REPO_ROOT / "public"
+DEFAULT_SOURCES = [REPO_ROOT / "data" / "scenes.json", REPO_ROOT / "data" / "scenes-with-audio.json"]
+DEFAULT_OUTPUT = PUBLIC_DIR / "data" / "scenes"
+
+HASH_LENGTH = 12
+
+# Fields copied into the index (what a gallery card needs); everything else stays in the shard
+SUMMARY_FIELDS = ("id", "title", "category", "imageUrl", "preview")
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def minify(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=True).encode()
+
+
+def merge_scene(base, extra):
+    merged = dict(base)
+    for key, value in extra.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_scene(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_scenes(sources):
+    """Later sources override earlier ones field by field; order follows the first"""
+    scenes = {}
+    for source in sources:
+        with open(source, 'r') as f:
+            for scene in json.load(f)["scenes"]:
+                scenes[scene["id"]] = merge_scene(scenes.get(scene["id"], {}), scene)
+    return list(scenes.values())
+
+
+def audio_hash(scene):
+    audio_url = scene.get("ourSolution", {}).get("audioUrl")
+    if not audio_url:
+        return None
+    audio_file = PUBLIC_DIR / audio_url.lstrip("/")
+    if not audio_file.exists():
+        return None
+    return content_hash(audio_file.read_bytes())
+
+
+def write_compressed(path, data):
+    """Write data plus .gz/.br siblings; returns sizes by encoding"""
+    path.write_bytes(data)
+    sizes = {"raw": len(data)}
+
+    # mtime=0 keeps the gzip bytes identical across rebuilds
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + ".gz").write_bytes(gz)
+    sizes["gzip"] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        path.with_name(path.name + ".br").write_bytes(br)
+        sizes["br"] = len(br)
+    return sizes
+
+
+def build(sources, output_dir):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    public_prefix = "/" + output_dir.relative_to(PUBLIC_DIR).as_posix()
+
+    index = []
+    written = set()
+    for scene in load_scenes(sources):
+        shard = minify(scene)
+        shard_name = f"{scene['id']}.{content_hash(shard)}.json"
+        sizes = write_compressed(output_dir / shard_name, shard)
+        written.update({shard_name, shard_name + ".gz", shard_name + ".br"})
+
+        entry = {field: scene[field] for field in SUMMARY_FIELDS if field in scene}
+        entry["audioHash"] = audio_hash(scene)
+        entry["detailUrl"] = f"{public_prefix}/{shard_name}"
+        index.append(entry)
+        print(f"   ✅ {shard_name:42} {sizes['raw']:6} B  gzip {sizes['gzip']:5} B")
+
+    index_data = minify({"version": 1, "scenes": index})
+    sizes = write_compressed(output_dir / "index.json", index_data)
+    written.update({"index.json", "index.json.gz", "index.json.br"})
+    print(f"\n📇 index.json: {sizes['raw']} B ({sizes['gzip']} B gzip) for {len(index)} scenes")
+
+    # Drop shards from earlier builds whose content hash no longer matches
+    stale = [p for p in output_dir.iterdir() if p.is_file() and p.name not in written]
+    for path in stale:
+        path.unlink()
+    if stale:
+        print(f"🧹 Removed {len(stale)} stale files")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sharded scene manifest")
+    parser.add_argument("--source", action="append", type=Path,
+                        help="Scene source JSON (repeatable; later files override earlier ones)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help="Output directory under public/")
+    args = parser.parse_args()
+
+    print("🗂️  Building sharded scene manifest")
+    print("─" * 70)
+    if brotli is None:
+        print("   ⚠️  brotli not installed, writing gzip only (pip install brotli)")
+    build(args.source or DEFAULT_SOURCES, args.output.resolve())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,16 @@ import requests
 import json
 from pathlib import Path
 
+import http_cassette
+import tts_client
+import usage_ledger
+
+http = http_cassette.get_session()
+
 # Read API key
-with open('.env', 'r') as f:
-    for line in f:
-        if line.startswith('ELEVENLABS_API_KEY='):
-            api_key = line.split('=', 1)[1].strip()
-            break
+api_key = tts_client.load_api_key()
+
+usage_ledger.set_context(experiment="callum-george-river-test")
 
 print("🎭 Testing Callum, George & River for African American Representation")
 print("─" * 70)
@@ -56,31 +60,24 @@ for voice in test_voices:
     print(f"   📝 {voice['description']}")
     
     for i, test_text in enumerate(test_texts):
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice['id']}"
-        
-        payload = {
-            "text": test_text,
-            "model_id": "eleven_monolingual_v1",
-            "voice_settings": {
-                "stability": 0.4,  # Slightly more dynamic for expression
-                "similarity_boost": 0.8,
-                "style": 0.7,
-                "use_speaker_boost": True
-            }
+        voice_settings = {
+            "stability": 0.4,  # Slightly more dynamic for expression
+            "similarity_boost": 0.8,
+            "style": 0.7,
+            "use_speaker_boost": True
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            audio = tts_client.synthesize(test_text, voice['id'], voice_settings, api_key=api_key)
             
-            if response.status_code == 200:
-                output_file = f"cgr-voice-tests/{voice['name'].lower()}-sample-{i+1}.wav"
-                with open(output_file, 'wb') as f:
-                    f.write(response.content)
-                print(f"   ✅ Sample {i+1}: {output_file}")
-                print(f"      Text: '{test_text[:50]}...'")
-            else:
-                print(f"   ❌ Sample {i+1} failed: {response.status_code}")
+            output_file = f"cgr-voice-tests/{voice['name'].lower()}-sample-{i+1}.wav"
+            with open(output_file, 'wb') as f:
+                f.write(audio)
+            print(f"   ✅ Sample {i+1}: {output_file}")
+            print(f"      Text: '{test_text[:50]}...'")
                 
+        except requests.HTTPError as e:
+            print(f"   ❌ Sample {i+1} failed: {e.response.status_code}")
         except Exception as e:
             print(f"   ❌ Error: {e}")
     
@@ -101,7 +98,7 @@ print("• Your choice should provide unique vocal qualities")
 
 # Get more details about these voices
 print("\n📋 Voice Details:")
-response = requests.get("https://api.elevenlabs.io/v1/voices", headers=headers)
+response = http.get("https://api.elevenlabs.io/v1/voices", headers=headers)
 if response.status_code == 200:
     all_voices = response.json()['voices']
     for voice in test_voices:
@@ -4,20 +4,21 @@ import requests
 import json
 from pathlib import Path
 
-# Read API key directly
+import tts_client
+import usage_ledger
+
+# Read API key
 try:
-    with open('.env', 'r') as f:
-        for line in f:
-            if line.startswith('ELEVENLABS_API_KEY='):
-                api_key = line.split('=', 1)[1].strip()
-                break
-        else:
-            print("❌ ELEVENLABS_API_KEY not found in .env")
-            exit(1)
+    api_key = tts_client.load_api_key()
+except KeyError:
+    print("❌ ELEVENLABS_API_KEY not found in .env")
+    exit(1)
 except FileNotFoundError:
     print("❌ .env file not found")
     exit(1)
 
+usage_ledger.set_context(experiment="direct-voice-test")
+
 print("🚀 ElevenLabs Voice Test - Direct Method")
 print("─" * 50)
 
@@ -43,32 +44,18 @@ success_count = 0
 for voice in test_voices:
     print(f"\n🎙️  Testing {voice['name']}...")
     
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice['id']}"
-    
-    payload = {
-        "text": test_text,
-        "model_id": "eleven_monolingual_v1",
-        "voice_settings": {
-            "stability": 0.5,
-            "similarity_boost": 0.8,
-            "style": 0.7,
-            "use_speaker_boost": True
-        }
-    }
-    
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        audio = tts_client.synthesize(test_text, voice['id'], api_key=api_key)
         
-        if response.status_code == 200:
-            # Save as WAV file
-            output_file = f"voice-tests/{voice['name'].lower()}-test.wav"
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
-            print(f"✅ Generated: {output_file}")
-            success_count += 1
-        else:
-            print(f"❌ Failed: {response.status_code} - {response.text}")
+        # Save as WAV file
+        output_file = f"voice-tests/{voice['name'].lower()}-test.wav"
+        with open(output_file, 'wb') as f:
+            f.write(audio)
+        print(f"✅ Generated: {output_file}")
+        success_count += 1
             
+    except requests.HTTPError as e:
+        print(f"❌ Failed: {e.response.status_code} - {e.response.text}")
     except Exception as e:
         print(f"❌ Error: {e}")
 
@@ -4,12 +4,16 @@ import requests
 import json
 from pathlib import Path
 
+import http_cassette
+import tts_client
+import usage_ledger
+
+http = http_cassette.get_session()
+
 # Read API key
-with open('.env', 'r') as f:
-    for line in f:
-        if line.startswith('ELEVENLABS_API_KEY='):
-            api_key = line.split('=', 1)[1].strip()
-            break
+api_key = tts_client.load_api_key()
+
+usage_ledger.set_context(experiment="diverse-voices-test")
 
 print("🎭 Testing Diverse Voice Selection")
 print("─" * 50)
@@ -70,31 +74,17 @@ for voice in diverse_voices:
     print(f"\n🔊 Testing {voice['name']}...")
     print(f"   📝 {voice['description']}")
     
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice['id']}"
-    
-    payload = {
-        "text": test_text,
-        "model_id": "eleven_monolingual_v1",
-        "voice_settings": {
-            "stability": 0.5,
-            "similarity_boost": 0.8,
-            "style": 0.7,
-            "use_speaker_boost": True
-        }
-    }
-    
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        audio = tts_client.synthesize(test_text, voice['id'], api_key=api_key)
         
-        if response.status_code == 200:
-            output_file = f"diverse-voice-tests/{voice['name'].lower()}-test.wav"
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
-            print(f"   ✅ Generated: {output_file}")
-            success_count += 1
-        else:
-            print(f"   ❌ Failed: {response.status_code}")
+        output_file = f"diverse-voice-tests/{voice['name'].lower()}-test.wav"
+        with open(output_file, 'wb') as f:
+            f.write(audio)
+        print(f"   ✅ Generated: {output_file}")
+        success_count += 1
             
+    except requests.HTTPError as e:
+        print(f"   ❌ Failed: {e.response.status_code}")
     except Exception as e:
         print(f"   ❌ Error: {e}")
 
@@ -104,7 +94,7 @@ print("🎧 Listen to files in: diverse-voice-tests/")
 # Show available voices for more options
 print("\n🌍 Available Diverse Voices Summary:")
 print("─" * 45)
-response = requests.get("https://api.elevenlabs.io/v1/voices", headers=headers)
+response = http.get("https://api.elevenlabs.io/v1/voices", headers=headers)
 if response.status_code == 200:
     all_voices = response.json()['voices']
     print("Female voices:")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Pick the few frames of each scene video worth sending to describe-frame.
+
+Each video is sampled at a low frame rate and decoded by ffmpeg at a small
+analysis resolution. Shot changes are found from colour-histogram and
+pixel differences between consecutive samples, computed for the whole clip
+at once with NumPy. Within a shot, a new segment starts whenever the
+picture drifts far enough from where the segment began (pans, slow
+reveals). Each segment contributes one representative frame: the sample
+closest to the segment's mean histogram. Those are re-extracted at full
+resolution and written with their timestamps.
+
+Usage:
+    python extract-keyframes.py                      # every scene in data/scenes.json
+    python extract-keyframes.py --scene matrix-lobby --fps 4
+Output:
+    keyframes/<scene-id>/<seconds>.jpg and keyframes/<scene-id>/keyframes.json
+"""
+import argparse
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+import audio_decode
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PUBLIC_DIR = REPO_ROOT / "public"
+DEFAULT_MANIFEST = REPO_ROOT / "data" / "scenes.json"
+
+ANALYSIS_WIDTH = 160
+ANALYSIS_HEIGHT = 90
+HIST_BITS = 3  # 8 levels per channel -> 512-bin RGB histogram
+
+
+def probe_size(path):
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        raise RuntimeError("ffprobe is required (it ships with ffmpeg)")
+    result = subprocess.run(
+        [ffprobe, "-v", "error",
+         "-select_streams", "v:0", "-show_entries", "stream=width,height", "-of", "json", str(path)],
+        capture_output=True, check=True
+    )
+    stream = json.loads(result.stdout)["streams"][0]
+    return stream["width"], stream["height"]
+
+
+def decode_frames(path, fps):
+    """(N, H, W, 3) uint8 frames sampled at ``fps``, scaled to the analysis size"""
+    frame_bytes = ANALYSIS_WIDTH * ANALYSIS_HEIGHT * 3
+    result = subprocess.run(
+        [audio_decode.ffmpeg_binary(), "-v", "error", "-nostdin", "-i", str(path),
+         "-vf", f"fps={fps},scale={ANALYSIS_WIDTH}:{ANALYSIS_HEIGHT}",
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"],
+        capture_output=True, check=True
+    )
+    count = len(result.stdout) // frame_bytes
+    frames = np.frombuffer(result.stdout[:count * frame_bytes], dtype=np.uint8)
+    return frames.reshape(count, ANALYSIS_HEIGHT, ANALYSIS_WIDTH, 3)
+
+
+def colour_histograms(frames):
+    """Normalised 512-bin RGB histogram per frame, all frames in one bincount"""
+    q = frames >> (8 - HIST_BITS)
+    bins = 1 << (3 * HIST_BITS)
+    index = (q[..., 0].astype(np.int32) << (2 * HIST_BITS)) | (q[..., 1].astype(np.int32) << HIST_BITS) | q[..., 2]
+    index = index.reshape(len(frames), -1) + (np.arange(len(frames))[:, None] * bins)
+    hist = np.bincount(index.ravel(), minlength=len(frames) * bins).reshape(len(frames), bins)
+    return hist / hist.sum(axis=1, keepdims=True)
+
+
+def change_scores(frames, hists):
+    """Per-transition change score in [0, 1]: histogram distance blended with pixel difference"""
+    if len(frames) < 2:
+        return np.zeros(0)
+    hist_distance = 0.5 * np.abs(np.diff(hists, axis=0)).sum(axis=1)
+    luma = frames.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    pixel_distance = np.abs(np.diff(luma, axis=0)).mean(axis=(1, 2)) / 255.0
+    return 0.7 * hist_distance + 0.3 * pixel_distance
+
+
+def find_cuts(scores, threshold, sensitivity):
+    """Indices where a new shot starts: above an absolute floor and well above the clip's norm"""
+    if not len(scores):
+        return np.zeros(0, dtype=int)
+    median = np.median(scores)
+    mad = np.median(np.abs(scores - median)) + 1e-6
+    adaptive = median + sensitivity * mad
+    return np.nonzero(scores > max(threshold, adaptive))[0] + 1
+
+
+def segment_shot(hists, start, end, drift):
+    """Split [start, end) wherever the picture drifts ``drift`` away from the segment start"""
+    bounds = [start]
+    anchor = hists[start]
+    for i in range(start + 1, end):
+        if 0.5 * np.abs(hists[i] - anchor).sum() > drift:
+            bounds.append(i)
+            anchor = hists[i]
+    return list(zip(bounds, bounds[1:] + [end]))
+
+
+def representative(hists, start, end):
+    """Sample closest to the segment's mean histogram"""
+    block = hists[start:end]
+    distance = np.abs(block - block.mean(axis=0)).sum(axis=1)
+    return start + int(np.argmin(distance))
+
+
+def select_keyframes(frames, fps, threshold=0.35, sensitivity=6.0, drift=0.5, min_shot=0.5):
+    hists = colour_histograms(frames)
+    scores = change_scores(frames, hists)
+    cuts = find_cuts(scores, threshold, sensitivity)
+
+    # Ignore cuts closer together than min_shot seconds (flashes, strobes)
+    min_gap = max(1, int(round(min_shot * fps)))
+    shot_starts = [0]
+    for cut in cuts:
+        if cut - shot_starts[-1] >= min_gap:
+            shot_starts.append(int(cut))
+    shot_bounds = list(zip(shot_starts, shot_starts[1:] + [len(frames)]))
+
+    keyframes = []
+    for shot, (start, end) in enumerate(shot_bounds):
+        for seg_start, seg_end in segment_shot(hists, start, end, drift):
+            index = representative(hists, seg_start, seg_end)
+            keyframes.append({
+                "index": index,
+                "time": round(index / fps, 3),
+                "shot": shot,
+                "span": [round(seg_start / fps, 3), round(seg_end / fps, 3)],
+                "change_score": round(float(scores[seg_start - 1]), 4) if seg_start else None,
+            })
+    return keyframes, len(shot_bounds)
+
+
+def write_keyframe(video, seconds, output_file):
+    subprocess.run(
+        [audio_decode.ffmpeg_binary(), "-v", "error", "-nostdin", "-y", "-ss", f"{seconds:.3f}",
+         "-i", str(video), "-frames:v", "1", "-q:v", "2", str(output_file)],
+        check=True
+    )
+
+
+def extract_scene(scene, output_root, fps, **options):
+    video = PUBLIC_DIR / scene["videoUrl"].lstrip("/")
+    frames = decode_frames(video, fps)
+    if not len(frames):
+        raise RuntimeError(f"No frames decoded from {video}")
+    keyframes, shots = select_keyframes(frames, fps, **options)
+
+    scene_dir = output_root / scene["id"]
+    scene_dir.mkdir(parents=True, exist_ok=True)
+    for old in scene_dir.glob("*.jpg"):
+        old.unlink()
+    for keyframe in keyframes:
+        keyframe["file"] = f"{keyframe['time']:08.3f}.jpg"
+        write_keyframe(video, keyframe["time"], scene_dir / keyframe["file"])
+
+    width, height = probe_size(video)
+    summary = {
+        "id": scene["id"],
+        "video": scene["videoUrl"],
+        "width": width,
+        "height": height,
+        "sample_fps": fps,
+        "sampled_frames": len(frames),
+        "shots": shots,
+        "keyframes": keyframes,
+    }
+    with open(scene_dir / "keyframes.json", 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract representative keyframes from scene videos")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--scene", action="append", help="Only these scene ids (repeatable)")
+    parser.add_argument("--output", type=Path, default=Path("keyframes"))
+    parser.add_argument("--fps", type=float, default=4.0, help="Analysis sample rate")
+    parser.add_argument("--threshold", type=float, default=0.35, help="Minimum change score for a cut")
+    parser.add_argument("--sensitivity", type=float, default=6.0,
+                        help="Cuts must also exceed median + N x MAD of the clip's scores")
+    parser.add_argument("--drift", type=float, default=0.5,
+                        help="Histogram drift within a shot that starts a new segment")
+    parser.add_argument("--min-shot", type=float, default=0.5, help="Shortest shot, seconds")
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r') as f:
+        scenes = [s for s in json.load(f)["scenes"] if not args.scene or s["id"] in args.scene]
+
+    print(f"🎞️  Extracting keyframes for {len(scenes)} scenes")
+    print("─" * 70)
+
+    sampled = selected = 0
+    for scene in scenes:
+        try:
+            summary = extract_scene(scene, args.output, args.fps, threshold=args.threshold,
+                                    sensitivity=args.sensitivity, drift=args.drift, min_shot=args.min_shot)
+        except Exception as e:
+            print(f"   ❌ {scene['id']}: {e}")
+            continue
+        sampled += summary["sampled_frames"]
+        selected += len(summary["keyframes"])
+        print(f"   ✅ {scene['id']:24} {summary['shots']:3} shots  "
+              f"{len(summary['keyframes']):3} keyframes from {summary['sampled_frames']} samples")
+
+    if selected:
+        print(f"\n📉 {selected} frames to describe instead of {sampled} ({sampled / selected:.1f}x fewer calls)")
+
+
+if __name__ == "__main__":
+    main()
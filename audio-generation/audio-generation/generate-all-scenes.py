@@ -1,25 +1,24 @@
 #!/usr/bin/env python3
-import os
+import argparse
 import requests
 import json
 from pathlib import Path
-import time
 
-# Read API key
-with open('.env', 'r') as f:
-    for line in f:
-        if line.startswith('ELEVENLABS_API_KEY='):
-            api_key = line.split('=', 1)[1].strip()
-            break
+import narration_timing
+import synthesis_scheduler
+import tts_backends
+import tts_client
+import usage_ledger
+import work_queue
+
+usage_ledger.set_context(experiment="generate-all-scenes")
+
+# Identical scene renders are served from here instead of re-billing
+CACHE_DIR = Path("synthesis-cache")
 
 print("🎬 Generating All Scene Audio with Josh, Rachel & Callum")
 print("─" * 70)
 
-headers = {
-    "xi-api-key": api_key,
-    "Content-Type": "application/json"
-}
-
 # Our selected voice trio
 VOICES = {
     "Josh": "TxGEqnHWrfWFTfGW9XjX",
@@ -105,74 +104,154 @@ SCENES = [
     }
 ]
 
-def generate_audio(scene, output_dir):
-    """Generate audio for a single scene"""
+def submit_audio(scene, scheduler, backend, priority, deadline):
+    """Queue audio generation for a single scene"""
     voice_id = VOICES[scene["voice"]]
     emotion_settings = EMOTIONAL_SETTINGS[scene["emotion"]]
     
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    
-    payload = {
-        "text": scene["text"],
-        "model_id": "eleven_monolingual_v1",
-        "voice_settings": emotion_settings
-    }
+    print(f"🎙️  Queued: {scene['title']}")
+    print(f"   🔊 Voice: {scene['voice']} | 🎭 Emotion: {scene['emotion']} | ⏱️  Priority: {priority}")
+    print(f"   📝 Text: {scene['text'][:60]}...")
     
+    return scheduler.submit(
+        scene["text"], voice_id, emotion_settings,
+        priority=priority, deadline=deadline, batch="generate-all-scenes",
+        scene_id=scene["id"], cache_dir=CACHE_DIR, backend=backend
+    )
+
+def save_audio(scene, future, output_dir, backend):
+    """Wait for a queued scene and write its audio"""
     try:
-        print(f"🎙️  Generating: {scene['title']}")
-        print(f"   🔊 Voice: {scene['voice']} | 🎭 Emotion: {scene['emotion']}")
-        print(f"   📝 Text: {scene['text'][:60]}...")
-        
-        response = requests.post(url, json=payload, headers=headers)
+        audio = future.result()
         
-        if response.status_code == 200:
-            output_file = output_dir / f"{scene['id']}.wav"
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
-            print(f"   ✅ Saved: {output_file}")
-            return True
-        else:
-            print(f"   ❌ Failed: {response.status_code} - {response.text}")
-            return False
+        output_file = output_dir / f"{scene['id']}.wav"
+        with open(output_file, 'wb') as f:
+            f.write(audio)
+        print(f"   ✅ Saved: {output_file}")
+        # Feeds the next `narration_timing.py fit`
+        narration_timing.record_sample(scene["text"], VOICES[scene["voice"]], EMOTIONAL_SETTINGS[scene["emotion"]],
+                                       backend.name, output_file)
+        return True
             
+    except requests.HTTPError as e:
+        print(f"   ❌ Failed: {e.response.status_code} - {e.response.text}")
+        return False
     except Exception as e:
         print(f"   ❌ Error: {e}")
         return False
 
+def check_timing(scenes, backend_name):
+    """Predict each narration's length and drop the ones that overrun their video"""
+    timing = narration_timing.get_timing()
+    with open(narration_timing.DEFAULT_MANIFEST, 'r') as f:
+        videos = {scene["id"]: scene for scene in json.load(f)["scenes"]}
+    
+    print("⏱️  Predicted narration length")
+    fitting = []
+    for scene in scenes:
+        seconds = timing.predict_duration(scene["text"], VOICES[scene["voice"]],
+                                          EMOTIONAL_SETTINGS[scene["emotion"]], backend_name)
+        segment = narration_timing.video_seconds(videos[scene["id"]]) if scene["id"] in videos else None
+        verdict = timing.segment_fit(seconds, segment)
+        if verdict is None:
+            print(f"   • {scene['id']:24} ~{seconds:5.1f}s")
+        else:
+            marks = {"overrun": "❌ overruns", "tight": "⚠️  tight", "ok": "✅"}
+            print(f"   • {scene['id']:24} ~{seconds:5.1f}s  video {segment:5.1f}s  {marks[verdict]}")
+        if verdict != "overrun":
+            fitting.append(scene)
+    return fitting
+
+def enqueue_scenes(scenes, args):
+    """Queue one synthesis job per scene for work_queue.py workers"""
+    queue = work_queue.WorkQueue(args.enqueue)
+    output_dir = args.output or ("generated-audio" if args.backend == "elevenlabs" else "draft-audio")
+    priority = {"interactive": 10, "normal": 5, "batch": 0}[args.priority]
+    
+    print(f"📥 Queueing {len(scenes)} scenes in {args.enqueue}")
+    print("─" * 70)
+    for scene in scenes:
+        payload = {
+            "text": scene["text"],
+            "voice_id": VOICES[scene["voice"]],
+            "voice_settings": EMOTIONAL_SETTINGS[scene["emotion"]],
+            "scene_id": scene["id"],
+            "backend": args.backend,
+            "cache_dir": str(CACHE_DIR)
+        }
+        # Same text/voice/settings → same job, so re-running this is harmless
+        dedupe_key = tts_client.cache_key(scene["text"], payload["voice_id"],
+                                          payload["voice_settings"], tts_client.DEFAULT_MODEL_ID, args.backend)
+        job_id, status = queue.enqueue("synthesize", payload, output=f"{output_dir}/{scene['id']}.wav",
+                                       dedupe_key=dedupe_key, priority=priority)
+        print(f"   • {scene['id']:24} job {job_id} ({status})")
+    
+    print(f"\n🚀 Start workers with: python work_queue.py worker --queue {args.enqueue}")
+
 def main():
-    # Create output directories
-    audio_dir = Path("generated-audio")
+    parser = argparse.ArgumentParser(description="Generate narration audio for every scene")
+    parser.add_argument("--backend", choices=sorted(tts_backends.BACKENDS), default="elevenlabs",
+                        help="'local' renders free offline drafts; final renders use 'elevenlabs'")
+    parser.add_argument("--output", help="Output directory (default depends on backend)")
+    parser.add_argument("--scene", action="append", help="Only generate these scene ids (repeatable)")
+    parser.add_argument("--priority", choices=synthesis_scheduler.PRIORITIES, default=synthesis_scheduler.BATCH,
+                        help="Use 'interactive' for urgent single-scene fixes")
+    parser.add_argument("--deadline", type=float, help="Give up on scenes not started within this many seconds")
+    parser.add_argument("--enqueue", metavar="QUEUE_DB",
+                        help="Add the scenes to a shared work queue instead of generating here")
+    parser.add_argument("--skip-overruns", action="store_true",
+                        help="Don't synthesize scenes predicted to outlast their video")
+    args = parser.parse_args()
+    
+    scenes = [scene for scene in SCENES if not args.scene or scene["id"] in args.scene]
+    fitting = check_timing(scenes, args.backend)
+    if args.skip_overruns:
+        scenes = fitting
+    print("─" * 70)
+    
+    if args.enqueue:
+        enqueue_scenes(scenes, args)
+        return
+    
+    backend = tts_backends.get_backend(args.backend)
+    
+    # Create output directories; drafts never overwrite the final renders
+    default_dir = "generated-audio" if args.backend == "elevenlabs" else "draft-audio"
+    audio_dir = Path(args.output or default_dir)
     audio_dir.mkdir(exist_ok=True)
     
-    print(f"🎯 Generating {len(SCENES)} scenes with 3 voices")
+    print(f"🎯 Generating {len(scenes)} scenes with 3 voices")
+    print(f"🔌 Backend: {backend.name}")
     print(f"📁 Output directory: {audio_dir}")
     print("─" * 70)
     
     success_count = 0
     failed_scenes = []
     
-    for i, scene in enumerate(SCENES):
-        print(f"\n📋 Scene {i+1}/{len(SCENES)}")
-        if generate_audio(scene, audio_dir):
-            success_count += 1
-        else:
-            failed_scenes.append(scene["title"])
+    # The scheduler spaces requests 1.5 seconds apart to avoid rate limiting
+    min_interval = 1.5 if backend.name == "elevenlabs" else 0.0
+    with synthesis_scheduler.SynthesisScheduler(min_interval=min_interval) as scheduler:
+        futures = [submit_audio(scene, scheduler, backend, args.priority, args.deadline) for scene in scenes]
+        print(f"\n⏳ Estimated time for the batch: {scheduler.eta():.0f}s")
         
-        # Add delay to avoid rate limiting (1.5 seconds between requests)
-        if i < len(SCENES) - 1:
-            time.sleep(1.5)
+        for i, (scene, future) in enumerate(zip(scenes, futures)):
+            print(f"\n📋 Scene {i+1}/{len(scenes)}: {scene['title']}")
+            if save_audio(scene, future, audio_dir, backend):
+                success_count += 1
+            else:
+                failed_scenes.append(scene["title"])
     
     # Print summary
     print(f"\n🎉 GENERATION COMPLETE")
     print("─" * 70)
-    print(f"✅ Successful: {success_count}/{len(SCENES)}")
+    print(f"✅ Successful: {success_count}/{len(scenes)}")
     
     if failed_scenes:
         print(f"❌ Failed scenes: {', '.join(failed_scenes)}")
     
     # Voice usage summary
     voice_usage = {}
-    for scene in SCENES:
+    for scene in scenes:
         voice = scene["voice"]
         voice_usage[voice] = voice_usage.get(voice, 0) + 1
     
@@ -182,7 +261,7 @@ def main():
     
     print(f"\n📊 Emotion Distribution:")
     emotion_usage = {}
-    for scene in SCENES:
+    for scene in scenes:
         emotion = scene["emotion"]
         emotion_usage[emotion] = emotion_usage.get(emotion, 0) + 1
     
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Precompute waveform peaks for every narration clip.
+
+Each clip is decoded once and reduced to min/max pairs at several
+resolutions, so AudioPlayer can draw a waveform from a few KB instead of
+decoding the whole MP3 in the browser. Peaks are written next to the audio
+(public/audio/peaks/<scene-id>.peaks) and referenced from the scene
+manifests as ``ourSolution.peaksUrl``.
+
+File layout (little-endian):
+    b"VNPK", u16 version, u16 level count, u32 sample rate, u32 total samples
+    per level: u32 samples per peak, u32 peak count
+    per level: int8[peak count * 2] interleaved (min, max), scaled to ±127
+"""
+import argparse
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+import audio_decode
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PUBLIC_DIR = REPO_ROOT / "public"
+DEFAULT_MANIFESTS = [REPO_ROOT / "data" / "scenes-with-audio.json", REPO_ROOT / "data" / "scenes.json"]
+
+MAGIC = b"VNPK"
+VERSION = 1
+# ~1700 / 430 / 110 peaks for a 10s clip: enough for full-width and thumbnail views
+LEVELS = (256, 1024, 4096)
+SAMPLE_RATE = 44100
+
+
+def compute_peaks(samples, samples_per_peak):
+    """Min/max of each block of ``samples_per_peak`` samples as int8 pairs"""
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    count = -(-len(mono) // samples_per_peak)
+    padded = np.zeros(count * samples_per_peak, dtype=np.float32)
+    padded[:len(mono)] = mono
+    blocks = padded.reshape(count, samples_per_peak)
+
+    pairs = np.empty((count, 2), dtype=np.float32)
+    pairs[:, 0] = blocks.min(axis=1)
+    pairs[:, 1] = blocks.max(axis=1)
+    return np.clip(np.round(pairs * 127), -127, 127).astype(np.int8).ravel()
+
+
+def encode_peaks(samples, sample_rate, levels=LEVELS):
+    arrays = [compute_peaks(samples, spp) for spp in levels]
+    header = MAGIC + struct.pack("<HHII", VERSION, len(levels), sample_rate, len(samples))
+    index = b"".join(struct.pack("<II", spp, len(arr) // 2) for spp, arr in zip(levels, arrays))
+    return header + index + b"".join(arr.tobytes() for arr in arrays)
+
+
+def peaks_path_for(audio_url):
+    audio_path = Path(audio_url.lstrip("/"))
+    return audio_path.parent / "peaks" / f"{audio_path.stem}.peaks"
+
+
+def build_peaks(scene, force=False):
+    """Write peaks for one scene; returns (manifest fields, was_rebuilt)"""
+    audio_url = scene["ourSolution"]["audioUrl"]
+    audio_file = PUBLIC_DIR / audio_url.lstrip("/")
+    peaks_rel = peaks_path_for(audio_url)
+    peaks_file = PUBLIC_DIR / peaks_rel
+
+    fresh = peaks_file.exists() and peaks_file.stat().st_mtime >= audio_file.stat().st_mtime
+    if fresh and not force:
+        _, _, sample_rate, total = struct.unpack_from("<HHII", peaks_file.read_bytes(), len(MAGIC))
+        rebuilt = False
+    else:
+        samples = audio_decode.decode_pcm(audio_file, SAMPLE_RATE)
+        peaks_file.parent.mkdir(parents=True, exist_ok=True)
+        peaks_file.write_bytes(encode_peaks(samples, SAMPLE_RATE))
+        sample_rate, total = SAMPLE_RATE, len(samples)
+        rebuilt = True
+
+    return {
+        "peaksUrl": "/" + peaks_rel.as_posix(),
+        "duration": round(total / sample_rate, 3),
+    }, rebuilt
+
+
+def update_manifest(manifest_path, fields_by_id):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    for scene in manifest["scenes"]:
+        if scene["id"] in fields_by_id:
+            scene["ourSolution"].update(fields_by_id[scene["id"]])
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute waveform peaks for scene audio")
+    parser.add_argument("--manifest", action="append", type=Path,
+                        help="Scene manifest(s) to read and update (default: data/scenes-with-audio.json and data/scenes.json)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if peaks are newer than the audio")
+    args = parser.parse_args()
+
+    manifests = args.manifest or DEFAULT_MANIFESTS
+    with open(manifests[0], 'r') as f:
+        scenes = json.load(f)["scenes"]
+
+    print("🌊 Generating waveform peaks")
+    print("─" * 60)
+
+    fields_by_id = {}
+    for scene in scenes:
+        if not scene.get("ourSolution", {}).get("audioUrl"):
+            continue
+        try:
+            fields, rebuilt = build_peaks(scene, args.force)
+        except Exception as e:
+            print(f"   ❌ {scene['id']}: {e}")
+            continue
+        fields_by_id[scene["id"]] = fields
+        size = (PUBLIC_DIR / fields["peaksUrl"].lstrip("/")).stat().st_size
+        status = "✅" if rebuilt else "⏭️ "
+        print(f"   {status} {scene['id']:24} {fields['duration']:6.2f}s  {size / 1024:.1f} KB")
+
+    for manifest_path in manifests:
+        update_manifest(manifest_path, fields_by_id)
+        print(f"\n📝 Updated {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Record/replay layer for the tooling's HTTP traffic.
+
+Every script gets its HTTP session from ``get_session()``. The mode comes
+from $TTS_CASSETTE_MODE:
+
+    off     (default) talk to the live APIs
+    record  talk to the live APIs and save each request/response pair
+    replay  serve saved responses from disk; never touch the network
+
+Cassettes live in $TTS_CASSETTE_DIR (default ``cassettes/``). Each
+interaction is a small JSON file named after a hash of the request
+(method, URL, body; credentials are never part of the key or the file),
+and response bodies are stored once per content hash under ``bodies/``, so
+the same clip returned for many requests costs one file.
+
+    TTS_CASSETTE_MODE=record python simple-test.py    # once, online
+    TTS_CASSETTE_MODE=replay python simple-test.py    # offline, deterministic
+
+Replay needs no credentials: without a .env, scripts get ``REPLAY_API_KEY``.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import requests
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (OFF, RECORD, REPLAY)
+
+DEFAULT_CASSETTE_DIR = "cassettes"
+
+# Stands in for ELEVENLABS_API_KEY when replaying; keys never reach the cassette
+REPLAY_API_KEY = "replay-no-key"
+
+# Response headers worth keeping; the rest are per-request noise
+KEPT_HEADERS = ("Content-Type", "character-cost", "request-id")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Replay mode was asked for a request that was never recorded"""
+
+
+def request_key(method, url, params=None, json_body=None, data=None):
+    body = json_body if json_body is not None else data
+    if isinstance(body, bytes):
+        body = hashlib.sha256(body).hexdigest()
+    blob = json.dumps([method.upper(), url, params, body], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class Cassette:
+    def __init__(self, directory=DEFAULT_CASSETTE_DIR):
+        self.directory = Path(directory)
+        self.interactions_dir = self.directory / "interactions"
+        self.bodies_dir = self.directory / "bodies"
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def save(self, key, method, url, response):
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            self.interactions_dir.mkdir(parents=True, exist_ok=True)
+            self.bodies_dir.mkdir(parents=True, exist_ok=True)
+            body_file = self.bodies_dir / body_hash
+            if not body_file.exists():
+                body_file.write_bytes(body)
+            interaction = {
+                "method": method.upper(),
+                "url": url,
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+                "body": body_hash,
+            }
+            with open(self.interactions_dir / f"{key}.json", 'w') as f:
+                json.dump(interaction, f, indent=2)
+            self._loaded[key] = (interaction, body)
+
+    def load(self, key):
+        with self._lock:
+            if key not in self._loaded:
+                path = self.interactions_dir / f"{key}.json"
+                if not path.exists():
+                    return None
+                with open(path, 'r') as f:
+                    interaction = json.load(f)
+                body = (self.bodies_dir / interaction["body"]).read_bytes()
+                self._loaded[key] = (interaction, body)
+            return self._loaded[key]
+
+
+def _build_response(interaction, body, prepared):
+    response = requests.Response()
+    response.status_code = interaction["status"]
+    response.reason = interaction.get("reason", "")
+    response.headers.update(interaction["headers"])
+    response._content = body
+    response.url = interaction["url"]
+    response.request = prepared
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class CassetteSession(requests.Session):
+    """requests.Session that records to or replays from a Cassette"""
+
+    def __init__(self, mode, cassette):
+        super().__init__()
+        self.mode = mode
+        self.cassette = cassette
+
+    def request(self, method, url, params=None, data=None, json=None, **kwargs):
+        key = request_key(method, url, params, json, data)
+
+        if self.mode == REPLAY:
+            found = self.cassette.load(key)
+            if found is None:
+                raise CassetteMiss(f"No recorded response for {method.upper()} {url} "
+                                   f"in {self.cassette.directory} (re-record with TTS_CASSETTE_MODE=record)")
+            interaction, body = found
+            prepared = requests.Request(method, url, params=params, data=data, json=json).prepare()
+            return _build_response(interaction, body, prepared)
+
+        response = super().request(method, url, params=params, data=data, json=json, **kwargs)
+        if self.mode == RECORD:
+            self.cassette.save(key, method, url, response)
+        return response
+
+
+def mode():
+    current = os.getenv("TTS_CASSETTE_MODE", OFF)
+    if current not in MODES:
+        raise ValueError(f"TTS_CASSETTE_MODE must be one of {', '.join(MODES)}, got '{current}'")
+    return current
+
+
+def replay_api_key():
+    """Placeholder key in replay mode, None otherwise"""
+    return REPLAY_API_KEY if mode() == REPLAY else None
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Shared session for all tooling HTTP calls, honouring $TTS_CASSETTE_MODE"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            current = mode()
+            if current == OFF:
+                _session = requests.Session()
+            else:
+                cassette = Cassette(os.getenv("TTS_CASSETTE_DIR", DEFAULT_CASSETTE_DIR))
+                _session = CassetteSession(current, cassette)
+        return _session
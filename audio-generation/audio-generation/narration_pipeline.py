@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Live frame -> description -> speech pipeline.
+
+Frames are pushed in with ``offer()``, described by a pluggable describer,
+voiced by a pluggable synthesizer and emitted as timed audio segments. Each
+stage is linked by a bounded asyncio queue. When synthesis falls behind, old
+frames are dropped at ingest and queued descriptions are merged so we always
+voice the newest scene; anything that would land past the latency budget is
+discarded rather than narrated late.
+
+Usage (replays a directory of still frames as a live stream):
+    python narration_pipeline.py frames/ --fps 2 --describer local
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import http_cassette
+import tts_backends
+import tts_client
+import usage_ledger
+
+DEFAULT_LATENCY_BUDGET = 3.0
+DEFAULT_QUEUE_SIZE = 4
+# While synthesis is slower than the budget, voice one frame this often so
+# the latency estimate can recover; everything else is dropped
+PROBE_INTERVAL = 10.0
+DESCRIBE_FRAME_URL = "http://localhost:3000/api/v1/describe-frame"
+
+
+@dataclass
+class Frame:
+    seq: int
+    timestamp: float  # position in the source stream, seconds
+    image: bytes
+    captured_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class Description:
+    frame: Frame
+    text: str
+    merged: int = 0
+
+
+@dataclass
+class AudioSegment:
+    seq: int
+    timestamp: float
+    text: str
+    audio: bytes
+    captured_at: float
+    latency: float = 0.0
+
+
+class StageMetrics:
+    """Rolling counters and latency samples for one stage"""
+
+    def __init__(self, name, window=500):
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.merged = 0
+        self.errors = 0
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.processed += 1
+        self.samples.append(seconds)
+
+    def percentile(self, pct):
+        """Nearest-rank percentile of the recorded samples (0.0 when empty)"""
+        samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[max(math.ceil(pct / 100 * len(samples)) - 1, 0)]
+
+    def summary(self):
+        samples = list(self.samples)
+        return {
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "errors": self.errors,
+            "p50_ms": round(statistics.median(samples) * 1000, 1) if samples else 0.0,
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+        }
+
+
+# ── Describers ────────────────────────────────────────────────────────────
+
+class LocalDescriber:
+    """Offline stand-in that returns a canned description per frame"""
+
+    def __init__(self, template="Frame {seq} at {timestamp:.1f} seconds", delay=0.0):
+        self.template = template
+        self.delay = delay
+
+    async def describe(self, frame):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.template.format(seq=frame.seq, timestamp=frame.timestamp)
+
+
+class ApiDescriber:
+    """Calls the /api/v1/describe-frame route"""
+
+    def __init__(self, api_key, url=DESCRIBE_FRAME_URL, timeout=10):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, frame):
+        response = http_cassette.get_session().post(
+            self.url,
+            json={"frame_base64": base64.b64encode(frame.image).decode("ascii")},
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["description"]
+
+    async def describe(self, frame):
+        return await asyncio.to_thread(self._post, frame)
+
+
+# ── Synthesizers ──────────────────────────────────────────────────────────
+
+class BackendSynthesizer:
+    """Runs a tts_backends backend (ElevenLabs or local) off the event loop"""
+
+    def __init__(self, voice_id, voice_settings=None, backend=None):
+        self.voice_id = voice_id
+        self.voice_settings = voice_settings
+        self.backend = tts_backends.get_backend(backend)
+
+    async def synthesize(self, text):
+        return await asyncio.to_thread(
+            tts_client.synthesize, text, self.voice_id,
+            self.voice_settings, backend=self.backend
+        )
+
+
+# ── Pipeline ──────────────────────────────────────────────────────────────
+
+class NarrationPipeline:
+    def __init__(self, describer, synthesizer, on_segment,
+                 latency_budget=DEFAULT_LATENCY_BUDGET, queue_size=DEFAULT_QUEUE_SIZE):
+        self.describer = describer
+        self.synthesizer = synthesizer
+        self.on_segment = on_segment
+        self.latency_budget = latency_budget
+
+        self.frames = asyncio.Queue(maxsize=queue_size)
+        self.descriptions = asyncio.Queue(maxsize=queue_size)
+        self.segments = asyncio.Queue(maxsize=queue_size)
+
+        self.metrics = {
+            name: StageMetrics(name)
+            for name in ("ingest", "describe", "synthesize", "emit", "end_to_end")
+        }
+        self._tasks = []
+        self._last_probe = float("-inf")
+
+    def _age(self, frame):
+        return time.monotonic() - frame.captured_at
+
+    def offer(self, frame):
+        """Non-blocking ingest; evicts the oldest queued frame when full"""
+        ingest = self.metrics["ingest"]
+        if self.frames.full():
+            self.frames.get_nowait()
+            self.frames.task_done()
+            ingest.dropped += 1
+        self.frames.put_nowait(frame)
+        ingest.record(0.0)
+
+    async def _describe_loop(self):
+        stage = self.metrics["describe"]
+        while True:
+            frame = await self.frames.get()
+            try:
+                if self._age(frame) > self.latency_budget:
+                    stage.dropped += 1
+                    continue
+                started = time.monotonic()
+                try:
+                    text = await self.describer.describe(frame)
+                except Exception as e:
+                    stage.errors += 1
+                    print(f"❌ Describe failed for frame {frame.seq}: {e}")
+                    continue
+                stage.record(time.monotonic() - started)
+                await self.descriptions.put(Description(frame, text))
+            finally:
+                self.frames.task_done()
+
+    def _take_newest_description(self, first):
+        """Collapse any backlog down to the newest fresh description"""
+        stage = self.metrics["synthesize"]
+        newest = first
+        taken = 1
+        while not self.descriptions.empty():
+            candidate = self.descriptions.get_nowait()
+            taken += 1
+            if self._age(candidate.frame) > self.latency_budget:
+                stage.dropped += 1
+                continue
+            candidate.merged = newest.merged + 1
+            stage.merged += 1
+            newest = candidate
+        return newest, taken
+
+    def _worth_synthesizing(self, frame):
+        """True if the frame should make the budget, or is due as a probe"""
+        predicted = self.metrics["synthesize"].percentile(50)
+        if self._age(frame) + predicted <= self.latency_budget:
+            return True
+        if predicted < self.latency_budget:
+            return False
+        # Nothing can make the budget, so the median only updates through
+        # an occasional probe synthesis
+        now = time.monotonic()
+        if now - self._last_probe < PROBE_INTERVAL:
+            return False
+        self._last_probe = now
+        return True
+
+    async def _synthesize_loop(self):
+        stage = self.metrics["synthesize"]
+        while True:
+            first = await self.descriptions.get()
+            item, taken = self._take_newest_description(first)
+            try:
+                # Voicing takes about as long as recent syntheses did, so a
+                # frame that can't make the budget is dropped before we pay
+                # for it
+                if not self._worth_synthesizing(item.frame):
+                    stage.dropped += 1
+                    continue
+                started = time.monotonic()
+                try:
+                    audio = await self.synthesizer.synthesize(item.text)
+                except Exception as e:
+                    stage.errors += 1
+                    print(f"❌ Synthesis failed for frame {item.frame.seq}: {e}")
+                    continue
+                stage.record(time.monotonic() - started)
+                await self.segments.put(AudioSegment(
+                    seq=item.frame.seq,
+                    timestamp=item.frame.timestamp,
+                    text=item.text,
+                    audio=audio,
+                    captured_at=item.frame.captured_at
+                ))
+            finally:
+                for _ in range(taken):
+                    self.descriptions.task_done()
+
+    async def _emit_loop(self):
+        stage = self.metrics["emit"]
+        end_to_end = self.metrics["end_to_end"]
+        while True:
+            segment = await self.segments.get()
+            try:
+                segment.latency = time.monotonic() - segment.captured_at
+                if segment.latency > self.latency_budget:
+                    end_to_end.dropped += 1
+                    continue
+                started = time.monotonic()
+                result = self.on_segment(segment)
+                if asyncio.iscoroutine(result):
+                    await result
+                stage.record(time.monotonic() - started)
+                end_to_end.record(segment.latency)
+            except Exception as e:
+                stage.errors += 1
+                print(f"❌ Emit failed for segment {segment.seq}: {e}")
+            finally:
+                self.segments.task_done()
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._describe_loop()),
+            asyncio.create_task(self._synthesize_loop()),
+            asyncio.create_task(self._emit_loop()),
+        ]
+
+    async def drain(self):
+        """Wait for everything already offered to finish, then stop"""
+        await self.frames.join()
+        await self.descriptions.join()
+        await self.segments.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def report(self):
+        return {name: stage.summary() for name, stage in self.metrics.items()}
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+async def replay_frames(pipeline, frame_paths, fps):
+    interval = 1.0 / fps
+    for seq, path in enumerate(frame_paths):
+        pipeline.offer(Frame(seq=seq, timestamp=seq * interval, image=path.read_bytes()))
+        await asyncio.sleep(interval)
+
+
+async def run(args):
+    usage_ledger.set_context(experiment="live-narration")
+    frame_paths = sorted(p for p in Path(args.frames).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.describer == "api":
+        describer = ApiDescriber(args.api_key, url=args.describe_url)
+    else:
+        describer = LocalDescriber()
+    synthesizer = BackendSynthesizer(args.voice_id, backend=args.backend)
+
+    timeline = []
+
+    def write_segment(segment):
+        audio_file = output_dir / f"segment-{segment.seq:05d}.wav"
+        tts_client.save_audio(segment.audio, audio_file)
+        timeline.append({
+            "seq": segment.seq,
+            "timestamp": segment.timestamp,
+            "text": segment.text,
+            "file": audio_file.name,
+            "latency_ms": round(segment.latency * 1000, 1)
+        })
+        print(f"   🔊 {segment.timestamp:6.1f}s  {segment.text[:60]}")
+
+    pipeline = NarrationPipeline(
+        describer, synthesizer, write_segment,
+        latency_budget=args.budget, queue_size=args.queue_size
+    )
+    pipeline.start()
+    await replay_frames(pipeline, frame_paths, args.fps)
+    await pipeline.drain()
+
+    report = pipeline.report()
+    with open(output_dir / "timeline.json", 'w') as f:
+        json.dump({"segments": timeline, "metrics": report}, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Narrate a frame stream in real time")
+    parser.add_argument("frames", help="Directory of frames, replayed in name order")
+    parser.add_argument("--output", default="live-narration")
+    parser.add_argument("--fps", type=float, default=1.0)
+    parser.add_argument("--budget", type=float, default=DEFAULT_LATENCY_BUDGET,
+                        help="End-to-end latency budget in seconds")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument("--describer", choices=["local", "api"], default="local")
+    parser.add_argument("--describe-url", default=DESCRIBE_FRAME_URL)
+    parser.add_argument("--api-key", help="Visual Narrator API key for --describer api")
+    parser.add_argument("--voice-id", default="TxGEqnHWrfWFTfGW9XjX")
+    parser.add_argument("--backend", choices=sorted(tts_backends.BACKENDS), default="elevenlabs")
+    args = parser.parse_args()
+
+    print("🎬 Live Narration Pipeline")
+    print("─" * 60)
+    report = asyncio.run(run(args))
+
+    print("\n📊 Stage metrics:")
+    for name, stats in report.items():
+        print(f"   • {name:11} processed={stats['processed']:4} dropped={stats['dropped']:3} "
+              f"merged={stats['merged']:3} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
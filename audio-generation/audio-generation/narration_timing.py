@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""Predict narration length and synthesis time before spending characters.
+
+Two small models, both plain least squares with NumPy:
+
+  duration  seconds of audio from text features (syllables, words, commas,
+            sentence stops, other breaks) and voice settings, with a
+            per-voice offset and speaking rate shrunk towards the global
+            fit so a voice with two clips does not run wild
+  latency   milliseconds per request from the character count, per backend,
+            fit on the usage ledger's non-cached calls
+
+Training clips come from ``generated-audio/`` (text, voice and emotion
+settings looked up in data/scenes.json and emotion-config.json) plus every
+clip generate-all-scenes.py has logged to $TTS_TIMING_SAMPLES since. Until
+``fit`` has been run, rough built-in rates are used.
+
+Usage:
+    python narration_timing.py fit
+    python narration_timing.py check                 # narration vs video length per scene
+    python narration_timing.py predict --voice-id TxGEqnHWrfWFTfGW9XjX --text "Neo arches..."
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+import audio_decode
+import usage_ledger
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+AUDIO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_MANIFEST = REPO_ROOT / "data" / "scenes.json"
+DEFAULT_AUDIO_DIR = AUDIO_ROOT / "generated-audio"
+EMOTION_CONFIG = AUDIO_ROOT / "emotion-config.json"
+
+MODEL_PATH = os.getenv("TTS_TIMING_MODEL", "timing-model.json")
+SAMPLES_PATH = os.getenv("TTS_TIMING_SAMPLES", "timing-samples.jsonl")
+
+# The clips in generated-audio/ were rendered with these voices
+VOICE_IDS = {
+    "Josh": "TxGEqnHWrfWFTfGW9XjX",
+    "Rachel": "XB0fDUnXU5powFXDhCwa",
+    "Callum": "N2lVS1w4EtoT3dr4eOWO",
+}
+
+TEXT_FEATURES = ("syllables", "words", "commas", "stops", "breaks")
+SETTING_FEATURES = ("stability", "style")
+FEATURES = TEXT_FEATURES + SETTING_FEATURES
+
+# Ridge penalties on standardised features; voice terms are penalised harder
+BASE_PENALTY = 1.0
+VOICE_PENALTY = 3.0
+MIN_RESIDUAL = 0.25
+
+# Used until `fit` has been run: ~4.5 syllables/s plus pauses
+DEFAULT_MODEL = {
+    "duration": {
+        "intercept": 0.3,
+        "coef": {"syllables": 0.22, "words": 0.0, "commas": 0.25, "stops": 0.45,
+                 "breaks": 0.3, "stability": 0.0, "style": 0.0},
+        "voices": {},
+        "residual": 1.5,
+        "samples": 0,
+    },
+    "latency": {
+        "elevenlabs": {"base_ms": 1200.0, "per_char_ms": 12.0, "samples": 0},
+        "local": {"base_ms": 150.0, "per_char_ms": 0.5, "samples": 0},
+    },
+}
+
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+_WORDS = re.compile(r"[A-Za-z0-9']+")
+
+
+def count_syllables(word):
+    word = word.lower().strip("'")
+    if word.isdigit():
+        return 2 * len(word)
+    count = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def text_features(text):
+    words = _WORDS.findall(text)
+    return {
+        "syllables": sum(count_syllables(w) for w in words),
+        "words": len(words),
+        "commas": text.count(","),
+        "stops": len(re.findall(r"[.!?]+", text)),
+        "breaks": len(re.findall(r"[;:()]|—|–| - |\.\.\.", text)),
+    }
+
+
+def voice_key(voice_id, backend="elevenlabs"):
+    return f"{backend}:{voice_id}"
+
+
+def feature_row(text, voice_settings=None):
+    settings = voice_settings or {}
+    features = text_features(text)
+    features["stability"] = settings.get("stability", 0.5)
+    features["style"] = settings.get("style", 0.0)
+    return [features[name] for name in FEATURES]
+
+
+# ── Training data ─────────────────────────────────────────────────────────
+
+_samples_lock = threading.Lock()
+
+
+def record_sample(text, voice_id, voice_settings, backend, audio_path, path=None):
+    """Log a freshly rendered clip so the next `fit` learns from it"""
+    sample = {
+        "text": text,
+        "voice_id": voice_id,
+        "voice_settings": {k: v for k, v in (voice_settings or {}).items() if k != "description"},
+        "backend": backend,
+        "audio": str(Path(audio_path).resolve()),
+        "recorded_at": time.time(),
+    }
+    with _samples_lock, open(path or SAMPLES_PATH, 'a') as f:
+        f.write(json.dumps(sample) + "\n")
+
+
+def seed_samples(manifest_path=DEFAULT_MANIFEST, audio_dir=DEFAULT_AUDIO_DIR):
+    """The scene clips already in generated-audio/"""
+    with open(EMOTION_CONFIG, 'r') as f:
+        emotional_settings = json.load(f)["emotional_settings"]
+    with open(manifest_path, 'r') as f:
+        scenes = json.load(f)["scenes"]
+
+    samples = []
+    for scene in scenes:
+        solution = scene["ourSolution"]
+        audio = Path(audio_dir) / f"{scene['id']}.wav"
+        if not audio.exists() or solution.get("voice") not in VOICE_IDS:
+            continue
+        samples.append({
+            "text": solution["text"],
+            "voice_id": VOICE_IDS[solution["voice"]],
+            "voice_settings": emotional_settings.get(solution.get("emotion"), {}),
+            "backend": "elevenlabs",
+            "audio": str(audio.resolve()),
+        })
+    return samples
+
+
+def logged_samples(path=SAMPLES_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_samples(manifest_path=DEFAULT_MANIFEST, audio_dir=DEFAULT_AUDIO_DIR, samples_path=SAMPLES_PATH):
+    """Seed clips plus logged ones; the latest entry wins for a re-rendered file"""
+    by_audio = {}
+    for sample in seed_samples(manifest_path, audio_dir) + logged_samples(samples_path):
+        by_audio[sample["audio"]] = sample
+
+    samples = []
+    for sample in by_audio.values():
+        if not os.path.exists(sample["audio"]):
+            continue
+        sample["duration"] = audio_decode.probe_duration(sample["audio"])
+        samples.append(sample)
+    return sorted(samples, key=lambda s: s["audio"])
+
+
+def ledger_latencies(path=usage_ledger.LEDGER_PATH):
+    """(backend, characters, latency_ms) for every call that actually hit a backend"""
+    if not os.path.exists(path):
+        return []
+    with sqlite3.connect(path) as conn:
+        return conn.execute(
+            "SELECT COALESCE(backend, 'elevenlabs'), characters, latency_ms "
+            "FROM synthesis_calls WHERE cache_hit = 0 ORDER BY id"
+        ).fetchall()
+
+
+# ── Fitting ───────────────────────────────────────────────────────────────
+
+def fit_duration(samples):
+    """Ridge fit in standardised space, returned as coefficients in raw units"""
+    # Speed scales the whole clip, so fit what it would have been at 1.0
+    y = np.array([s["duration"] * s["voice_settings"].get("speed", 1.0) for s in samples])
+    raw = np.array([feature_row(s["text"], s["voice_settings"]) for s in samples], dtype=np.float64)
+    mean = raw.mean(axis=0)
+    std = raw.std(axis=0)
+    std[std == 0] = 1.0
+    z = (raw - mean) / std
+
+    keys = sorted({voice_key(s["voice_id"], s["backend"]) for s in samples})
+    onehot = np.array([[voice_key(s["voice_id"], s["backend"]) == k for k in keys] for s in samples],
+                      dtype=np.float64)
+    syllables_z = z[:, FEATURES.index("syllables")][:, None]
+
+    X = np.hstack([np.ones((len(samples), 1)), z, onehot, onehot * syllables_z])
+    penalty = np.concatenate([[0.0], np.full(len(FEATURES), BASE_PENALTY), np.full(2 * len(keys), VOICE_PENALTY)])
+    w = np.linalg.solve(X.T @ X + np.diag(penalty), X.T @ y)
+
+    residual = np.sqrt(np.mean((X @ w - y) ** 2))
+    base = w[1:1 + len(FEATURES)] / std
+    offsets = w[1 + len(FEATURES):1 + len(FEATURES) + len(keys)]
+    rates = w[1 + len(FEATURES) + len(keys):]
+    syl = FEATURES.index("syllables")
+
+    voices = {}
+    for i, key in enumerate(keys):
+        per_syllable = rates[i] / std[syl]
+        voices[key] = {
+            "offset": round(float(offsets[i] - per_syllable * mean[syl]), 4),
+            "per_syllable": round(float(per_syllable), 5),
+            "samples": int(onehot[:, i].sum()),
+        }
+    return {
+        "intercept": round(float(w[0] - (base * mean).sum()), 4),
+        "coef": {name: round(float(c), 5) for name, c in zip(FEATURES, base)},
+        "voices": voices,
+        "residual": round(float(max(residual, MIN_RESIDUAL)), 3),
+        "samples": len(samples),
+    }
+
+
+def fit_latency(rows):
+    latency = {backend: dict(model) for backend, model in DEFAULT_MODEL["latency"].items()}
+    for backend in sorted({row[0] for row in rows}):
+        data = np.array([(chars, ms) for b, chars, ms in rows if b == backend], dtype=np.float64)
+        if len(data) < 3 or np.ptp(data[:, 0]) == 0:
+            # Not enough spread to fit a slope; keep the default rate, learn the level
+            default = latency.get(backend, DEFAULT_MODEL["latency"]["elevenlabs"])
+            base = float(np.median(data[:, 1] - default["per_char_ms"] * data[:, 0]))
+            latency[backend] = {"base_ms": round(base, 1), "per_char_ms": default["per_char_ms"],
+                                "samples": len(data)}
+            continue
+        X = np.column_stack([np.ones(len(data)), data[:, 0]])
+        (base, per_char), *_ = np.linalg.lstsq(X, data[:, 1], rcond=None)
+        latency[backend] = {"base_ms": round(float(max(base, 0.0)), 1),
+                            "per_char_ms": round(float(max(per_char, 0.0)), 3),
+                            "samples": len(data)}
+    return latency
+
+
+def fit(samples, latency_rows):
+    model = {"fitted_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    model["duration"] = fit_duration(samples) if samples else dict(DEFAULT_MODEL["duration"])
+    model["latency"] = fit_latency(latency_rows)
+    return model
+
+
+def save_model(model, path=MODEL_PATH):
+    with open(path, 'w') as f:
+        json.dump(model, f, indent=2)
+
+
+def load_model(path=MODEL_PATH):
+    if not os.path.exists(path):
+        return DEFAULT_MODEL
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+# ── Prediction ────────────────────────────────────────────────────────────
+
+class NarrationTiming:
+    def __init__(self, model=None):
+        self.model = model or load_model()
+
+    def predict_duration(self, text, voice_id, voice_settings=None, backend="elevenlabs"):
+        """Expected clip length in seconds"""
+        duration = self.model["duration"]
+        row = dict(zip(FEATURES, feature_row(text, voice_settings)))
+        seconds = duration["intercept"] + sum(duration["coef"][name] * row[name] for name in FEATURES)
+        voice = duration["voices"].get(voice_key(voice_id, backend))
+        if voice:
+            seconds += voice["offset"] + voice["per_syllable"] * row["syllables"]
+        speed = (voice_settings or {}).get("speed", 1.0)
+        return max(0.5, seconds / speed)
+
+    def predict_latency(self, characters, backend="elevenlabs"):
+        """Expected request time in seconds"""
+        latency = self.model["latency"].get(backend) or self.model["latency"]["elevenlabs"]
+        return (latency["base_ms"] + latency["per_char_ms"] * characters) / 1000
+
+    def segment_fit(self, seconds, segment_seconds):
+        """'overrun' if the narration is expected to outlast its video segment,
+        'tight' if it only fits when the prediction errs on the short side"""
+        if segment_seconds is None:
+            return None
+        if seconds > segment_seconds:
+            return "overrun"
+        if seconds + self.model["duration"]["residual"] > segment_seconds:
+            return "tight"
+        return "ok"
+
+
+def batch_eta(latencies, concurrency=1, min_interval=0.0):
+    """Seconds to work through requests with the given latencies.
+
+    Bound by whichever is slower: the workers, or the rate limit spacing
+    request starts ``min_interval`` apart.
+    """
+    if not latencies:
+        return 0.0
+    worker_bound = max(sum(latencies) / concurrency, max(latencies))
+    rate_bound = (len(latencies) - 1) * min_interval + latencies[-1]
+    return max(worker_bound, rate_bound)
+
+
+def video_seconds(scene):
+    """Length of a scene's video segment, if we can tell"""
+    if "segmentSeconds" in scene:
+        return scene["segmentSeconds"]
+    video = REPO_ROOT / "public" / scene.get("videoUrl", "").lstrip("/")
+    if not scene.get("videoUrl") or not video.exists():
+        return None
+    try:
+        return audio_decode.probe_duration(video)
+    except (RuntimeError, subprocess.CalledProcessError, ValueError) as e:
+        # No ffprobe, or an un-pulled LFS pointer in place of the video
+        print(f"⚠️  Can't read length of {video.name}, treating it as unknown: {e}")
+        return None
+
+
+_timing = None
+_timing_lock = threading.Lock()
+
+
+def get_timing():
+    global _timing
+    with _timing_lock:
+        if _timing is None:
+            _timing = NarrationTiming()
+        return _timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Narration duration and synthesis latency predictor")
+    parser.add_argument("--model", default=MODEL_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fit_cmd = sub.add_parser("fit", help="Fit on generated-audio/, logged clips and the usage ledger")
+    fit_cmd.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    fit_cmd.add_argument("--audio-dir", type=Path, default=DEFAULT_AUDIO_DIR)
+    fit_cmd.add_argument("--samples", default=SAMPLES_PATH)
+    fit_cmd.add_argument("--ledger", default=usage_ledger.LEDGER_PATH)
+
+    check_cmd = sub.add_parser("check", help="Compare predicted narration length with each scene's video")
+    check_cmd.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+
+    predict_cmd = sub.add_parser("predict", help="Predict one narration")
+    predict_cmd.add_argument("--text", required=True)
+    predict_cmd.add_argument("--voice-id", required=True)
+    predict_cmd.add_argument("--settings", type=json.loads, default=None, help="voice_settings as JSON")
+    predict_cmd.add_argument("--backend", default="elevenlabs")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        samples = load_samples(args.manifest, args.audio_dir, args.samples)
+        rows = ledger_latencies(args.ledger)
+        model = fit(samples, rows)
+        save_model(model, args.model)
+
+        duration = model["duration"]
+        print(f"📈 Duration model: {len(samples)} clips, ±{duration['residual']:.2f}s RMS")
+        for key, voice in sorted(duration["voices"].items()):
+            print(f"   • {key:36} {voice['samples']:3} clips")
+        print(f"⏱️  Latency model: {len(rows)} ledger calls")
+        for backend, latency in model["latency"].items():
+            print(f"   • {backend:12} {latency['base_ms']:7.0f}ms + {latency['per_char_ms']:.2f}ms/char "
+                  f"({latency['samples']} calls)")
+        print(f"💾 Saved {args.model}")
+        return
+
+    timing = NarrationTiming(load_model(args.model))
+
+    if args.command == "predict":
+        seconds = timing.predict_duration(args.text, args.voice_id, args.settings, args.backend)
+        latency = timing.predict_latency(len(args.text), args.backend)
+        print(f"🎙️  ~{seconds:.1f}s of narration (±{timing.model['duration']['residual']:.1f}s), "
+              f"~{latency:.1f}s to synthesize")
+        return
+
+    with open(EMOTION_CONFIG, 'r') as f:
+        emotional_settings = json.load(f)["emotional_settings"]
+    with open(args.manifest, 'r') as f:
+        scenes = json.load(f)["scenes"]
+
+    print("🎬 Narration vs video length")
+    print("─" * 70)
+    for scene in scenes:
+        solution = scene["ourSolution"]
+        seconds = timing.predict_duration(solution["text"], VOICE_IDS.get(solution.get("voice"), solution.get("voice")),
+                                          emotional_settings.get(solution.get("emotion")))
+        segment = video_seconds(scene)
+        verdict = timing.segment_fit(seconds, segment)
+        marks = {"overrun": "❌ overruns", "tight": "⚠️  tight", "ok": "✅", None: "(video length unknown)"}
+        video = f"video {segment:5.1f}s" if segment is not None else ""
+        print(f"   {scene['id']:24} ~{seconds:5.1f}s  {video:12} {marks[verdict]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Score competitor captions against our narration, reproducibly.
+
+Every caption in the manifest (each provider under ``competitors`` plus
+``ourSolution.text``) is tokenised and turned into a hashed bag of words,
+word bigrams and character trigrams. The hashing is keyed, not Python's
+``hash()``, and uses no corpus statistics, so a caption's vector depends on
+its text alone: vectors are cached by text hash and re-used across runs,
+and the same manifest always produces the same scoreboard.
+
+Scores are array operations over chunks of scenes, so memory stays flat
+however many scenes the manifest holds:
+
+  similarity  cosine similarity between every pair of captions in a scene
+  counts      noun, spatial and adjective terms per caption
+  coverage    share of our noun/spatial/adjective terms a provider also
+              mentions
+
+Term classes come from small general-purpose lexicons and suffix rules
+rather than a tagger, which keeps the numbers stable between machines and
+library versions. A content word that is not spatial, an adjective, a verb
+or an adverb is counted as a noun. The lexicons are deliberately not
+derived from any provider's captions; treat the classes as consistent
+proxies, not linguistic ground truth.
+
+Usage:
+    python score-captions.py
+    python score-captions.py --manifest ../../data/scenes.json --output scoreboard.json
+"""
+import argparse
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MANIFEST = REPO_ROOT / "data" / "scenes.json"
+DEFAULT_OUTPUT = REPO_ROOT / "data" / "caption-scoreboard.json"
+DEFAULT_CACHE = Path("caption-cache")
+
+OURS = "ours"
+CATEGORIES = ("nouns", "spatial", "adjectives")
+
+# Bump whenever tokenisation, stopwords or hashing change so cached vectors are not reused
+VECTORIZER_VERSION = 2
+DIMENSIONS = 4096
+FEATURE_WEIGHTS = {"word": 1.0, "bigram": 0.5, "trigram": 0.25}
+CHUNK_SCENES = 256
+
+STOPWORDS = frozenset("""
+a an the and or but nor of to in on at by for with from as is are was were be been being it its
+his her their them they he she him we our you your this that these those each every which who whom
+whose what while than then so such very too just also into onto upon out up down off over under
+like unlike i me my mine hers theirs ours yours myself yourself himself herself itself ourselves
+yourselves themselves oneself
+""".split())
+
+SPATIAL = frozenset("""
+above across against along amid amidst among around atop behind below beneath beside besides between
+beyond by inside into near nearby next onto opposite outside over past through throughout toward towards
+under underneath within without left right front back top bottom middle center centre distant far
+foreground background overhead upward upwards downward downwards forward backward backwards sideways
+horizon edge corner surface interior exterior beside alongside ahead around aerial
+""".split())
+
+# General-purpose descriptors grouped by Dixon's core adjective types (dimension,
+# age, value, colour, physical property, speed, human propensity). Kept
+# independent of the captions being scored so no provider is favoured.
+ADJECTIVES = frozenset("""
+big small large little huge tiny giant massive vast enormous tall short long wide narrow broad deep
+shallow high low thick thin round square flat straight curved
+old new young ancient modern fresh
+good bad fine great poor beautiful ugly nice pretty perfect strange odd ordinary
+black white red blue green yellow orange purple pink gray grey brown golden silver dark bright pale
+colorful colourful
+hard soft heavy light rough smooth hot cold warm cool wet dry clean dirty sharp strong weak full empty
+loud quiet shiny dull clear dense solid liquid
+fast slow quick rapid sudden
+happy sad angry calm brave afraid proud kind cruel gentle fierce wild busy lonely
+""".split())
+
+ADJECTIVE_SUFFIXES = ("ous", "ful", "ive", "ic", "al", "less", "able", "ible", "ent", "ant", "ish", "esque")
+
+# Common nouns the suffix rules above would otherwise call adjectives
+# ('-ment' nouns are excluded by rule)
+SUFFIX_NOUNS = frozenset("""
+animal metal signal crystal portal hospital festival capital interval journal canal total rival
+arrival proposal approval survival removal trial ritual manual mammal cathedral corral pedal petal
+scandal material principal criminal official arsenal carnival terminal tribunal vessel
+student agent parent patient element talent client content percent accident president incident
+resident event current comment segment moment parliament continent opponent component ingredient
+giant plant restaurant servant assistant merchant elephant infant tenant peasant instant
+applicant participant occupant descendant lieutenant sergeant pendant
+traffic topic logic fabric panic mechanic clinic republic graphic music critic relic mosaic attic
+native olive archive motive objective executive detective relative representative explosive
+finish polish radish dish
+vegetable cable table stable constable
+""".split())
+
+# Common English verbs (base forms), which the noun fallback would otherwise
+# count: general-purpose verbs plus verbs of motion, light and sound
+VERBS = frozenset("""
+be have do say get make go know take see come think look want give use find tell ask work seem feel
+try leave call keep let begin help show hear play run move live believe hold bring happen write sit
+stand lose pay meet include continue set learn change lead understand watch follow stop create speak
+read spend grow open walk win offer remember consider appear buy wait serve die send expect build stay
+fall cut reach kill remain suggest raise pass sell require report decide pull fly turn rise carry
+add allow become break catch choose close cover cross describe destroy develop draw drive drop eat
+enter explain fill fight fix forget hang hide hit hurry improve join jump kick kneel knock laugh lay
+lean lie lift listen mean mention miss notice obtain occur perform pick place point prepare prevent
+produce protect prove push put reduce refuse rely remove repeat replace reply rest return reveal ride
+ring roll rush save seize shake share shoot shout shut sing sink sleep slide smile speed spread
+squeeze stare steal stick strike struggle swim swing teach tear throw touch track travel treat trust
+visit wake wander wash wear whisper wish wonder worry
+accelerate advance approach ascend attack avoid bend blast bounce burst charge chase circle climb
+collapse collide crash crawl creep crouch cruise dash dart descend dispatch dodge drift duck emerge
+escape evade explode float flee flip fold glide hover hurl launch leap lunge march orbit plunge
+pursue race retreat rotate sail scatter scramble shift skid slam slip soar spin spiral sprint stagger
+stomp stride stumble surge sway sweep swirl swoop topple tumble twirl twist vanish weave whirl zoom
+align arch billow bow curl dangle drape flap flutter quiver ripple shudder stretch tilt tremble wave
+wobble
+blaze blink dim flare flash flicker gleam glimmer glint glisten glitch radiate shimmer shine
+sparkle twinkle
+beep buzz chime clang clatter creak crackle echo growl hiss howl hum murmur rattle rumble
+rustle scream screech shriek sizzle thud thunder whistle
+""".split())
+
+_TOKEN = re.compile(r"[a-z][a-z'-]*")
+
+
+def text_hash(text):
+    return hashlib.sha256(f"v{VECTORIZER_VERSION}:{text}".encode()).hexdigest()[:20]
+
+
+def tokenize(text):
+    return [t.strip("'-") for t in _TOKEN.findall(text.lower()) if t.strip("'-")]
+
+
+def stem(word):
+    """Just enough folding that 'stars'/'star' and 'bullets'/'bullet' match"""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def is_verb(word):
+    """Base form or -s/-es form of a lexicon verb ('spins', 'dispatches')"""
+    if word in VERBS or stem(word) in VERBS:
+        return True
+    return word.endswith(("ches", "shes", "sses", "xes", "zes")) and word[:-2] in VERBS
+
+
+def term_class(word):
+    """'spatial', 'adjectives', 'nouns' or None for a single lower-case token"""
+    if word in SPATIAL:
+        return "spatial"
+    if word in STOPWORDS:
+        return None
+    base = stem(word)
+    if word in ADJECTIVES or (
+        word.endswith(ADJECTIVE_SUFFIXES) and len(word) > 5
+        and not word.endswith("ment") and base not in SUFFIX_NOUNS
+    ):
+        return "adjectives"
+    if is_verb(word) or word.endswith(("ly", "ing", "ed")) or len(word) < 3:
+        return None
+    return "nouns"
+
+
+def features(text):
+    words = tokenize(text)
+    stems = [stem(w) for w in words if w not in STOPWORDS]
+    feats = [("word", s) for s in stems]
+    feats += [("bigram", f"{a} {b}") for a, b in zip(stems, stems[1:])]
+    for s in stems:
+        padded = f"<{s}>"
+        feats += [("trigram", padded[i:i + 3]) for i in range(len(padded) - 2)]
+    return feats
+
+
+def _bucket(kind, token):
+    digest = hashlib.blake2b(f"{kind}:{token}".encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % DIMENSIONS, 1.0 if value >> 63 else -1.0
+
+
+def vectorize(texts):
+    """(len(texts), DIMENSIONS) L2-normalised float32 hashed feature vectors"""
+    rows, cols, values = [], [], []
+    for row, text in enumerate(texts):
+        for kind, token in features(text):
+            col, sign = _bucket(kind, token)
+            rows.append(row)
+            cols.append(col)
+            values.append(sign * FEATURE_WEIGHTS[kind])
+    matrix = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+    np.add.at(matrix, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)),
+              np.array(values, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorCache:
+    """Caption vectors keyed by text hash.
+
+    A caption touches a few hundred of the DIMENSIONS buckets, so vectors
+    are kept sparse (bucket indices + float32 values, stored CSR-style in
+    one .npz) and only densified a chunk at a time in ``lookup``.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE):
+        self.path = Path(directory) / f"sparse-vectors-v{VECTORIZER_VERSION}-{DIMENSIONS}.npz"
+        self.vectors = {}
+        if self.path.exists():
+            with np.load(self.path) as data:
+                offsets, indices, values = data["offsets"], data["indices"], data["values"]
+                for i, key in enumerate(data["keys"].tolist()):
+                    self.vectors[key] = (indices[offsets[i]:offsets[i + 1]], values[offsets[i]:offsets[i + 1]])
+        self.misses = 0
+
+    def lookup(self, texts):
+        keys = [text_hash(t) for t in texts]
+        missing = sorted({k: t for k, t in zip(keys, texts) if k not in self.vectors}.items())
+        if missing:
+            self.misses += len(missing)
+            for (key, _), dense in zip(missing, vectorize([t for _, t in missing])):
+                nonzero = np.flatnonzero(dense).astype(np.uint16)
+                self.vectors[key] = (nonzero, dense[nonzero])
+
+        matrix = np.zeros((len(keys), DIMENSIONS), dtype=np.float32)
+        for row, key in enumerate(keys):
+            indices, values = self.vectors[key]
+            matrix[row, indices] = values
+        return matrix
+
+    def save(self):
+        if not self.misses:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        keys = sorted(self.vectors)
+        sizes = [len(self.vectors[k][0]) for k in keys]
+        offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        tmp = self.path.with_name(self.path.name + ".tmp.npz")
+        np.savez_compressed(
+            tmp, keys=np.array(keys), offsets=offsets,
+            indices=np.concatenate([self.vectors[k][0] for k in keys]) if keys else np.zeros(0, np.uint16),
+            values=np.concatenate([self.vectors[k][1] for k in keys]) if keys else np.zeros(0, np.float32),
+        )
+        tmp.replace(self.path)
+
+
+def term_matrices(texts):
+    """Per-caption term counts (captions x vocab) and the vocab's class masks.
+
+    A term is a (stem, class) pair, with the class taken from the word as
+    written, so 'stars' and 'star' match but a term's class never depends on
+    which caption happened to use it first.
+    """
+    terms = [[(stem(w), term_class(w)) for w in tokenize(t)] for t in texts]
+    vocab = {}
+    for caption in terms:
+        for term in caption:
+            vocab.setdefault(term, len(vocab))
+    counts = np.zeros((len(texts), len(vocab)))
+    for row, caption in enumerate(terms):
+        np.add.at(counts[row], [vocab[term] for term in caption], 1)
+    masks = np.zeros((len(CATEGORIES), len(vocab)))
+    for (_, term_cls), col in vocab.items():
+        if term_cls is not None:
+            masks[CATEGORIES.index(term_cls), col] = 1.0
+    return counts, masks
+
+
+def chunk_scores(chunk, cache):
+    """Similarity (scenes x providers x providers), class counts and our-term
+    coverage (scenes x providers x classes) for one chunk of scenes"""
+    n_scenes, n_providers = len(chunk), len(chunk[0])
+    texts = [text for row in chunk for text in row]
+
+    vectors = cache.lookup(texts).reshape(n_scenes, n_providers, -1)
+    similarity = np.einsum("spd,sqd->spq", vectors, vectors)
+
+    counts, masks = term_matrices(texts)
+    class_counts = (counts @ masks.T).reshape(n_scenes, n_providers, -1)
+
+    # Recall of our distinct terms, per class: |ours ∩ theirs| / |ours|
+    mentioned = (counts > 0).astype(np.float64).reshape(n_scenes, n_providers, -1)
+    ours = mentioned[:, -1:, :]
+    shared = np.einsum("spv,cv->spc", mentioned * ours, masks)
+    ours_total = np.einsum("sv,cv->sc", ours[:, 0, :], masks)[:, None, :]
+    coverage = np.divide(shared, ours_total, out=np.zeros_like(shared), where=ours_total > 0)
+    return similarity, class_counts, coverage
+
+
+def load_captions(manifest_path):
+    """Scene ids, provider names and a (scenes x providers) grid of captions ('' if missing)"""
+    with open(manifest_path, 'r') as f:
+        scenes = json.load(f)["scenes"]
+    providers = sorted({p for scene in scenes for p in scene.get("competitors", {})}) + [OURS]
+    grid = [
+        [scene.get("competitors", {}).get(p, "") for p in providers[:-1]] + [scene["ourSolution"]["text"]]
+        for scene in scenes
+    ]
+    return [scene["id"] for scene in scenes], providers, grid
+
+
+def score(scene_ids, providers, grid, cache):
+    n_scenes, n_providers = len(grid), len(providers)
+    present = np.array([[bool(text.strip()) for text in row] for row in grid]).reshape(n_scenes, n_providers)
+
+    # Chunked so dense vectors and caption-by-term matrices stay small
+    # however large the manifest gets
+    similarity = np.zeros((n_scenes, n_providers, n_providers), dtype=np.float32)
+    class_counts = np.zeros((n_scenes, n_providers, len(CATEGORIES)))
+    coverage = np.zeros_like(class_counts)
+    for start in range(0, n_scenes, CHUNK_SCENES):
+        end = start + CHUNK_SCENES
+        similarity[start:end], class_counts[start:end], coverage[start:end] = chunk_scores(grid[start:end], cache)
+
+    scenes = []
+    for s, scene_id in enumerate(scene_ids):
+        entry = {"id": scene_id, "similarity": {}, "counts": {}, "coverage": {}}
+        for p, provider in enumerate(providers):
+            if not present[s, p]:
+                continue
+            entry["counts"][provider] = {c: int(class_counts[s, p, i]) for i, c in enumerate(CATEGORIES)}
+            if provider != OURS:
+                entry["similarity"][provider] = round(float(similarity[s, p, -1]), 4)
+                entry["coverage"][provider] = {c: round(float(coverage[s, p, i]), 4)
+                                               for i, c in enumerate(CATEGORIES)}
+        kept = [p for p in range(n_providers) if present[s, p]]
+        entry["pairwise"] = {
+            "providers": [providers[p] for p in kept],
+            "matrix": np.round(similarity[s][np.ix_(kept, kept)], 4).tolist(),
+        }
+        scenes.append(entry)
+
+    summary = {}
+    for p, provider in enumerate(providers):
+        rows = present[:, p]
+        if not rows.any():
+            continue
+        stats = {
+            "scenes": int(rows.sum()),
+            "mean_counts": {c: round(float(class_counts[rows, p, i].mean()), 3) for i, c in enumerate(CATEGORIES)},
+        }
+        if provider != OURS:
+            stats["mean_similarity"] = round(float(similarity[rows, p, -1].mean()), 4)
+            stats["mean_coverage"] = {c: round(float(coverage[rows, p, i].mean()), 4)
+                                      for i, c in enumerate(CATEGORIES)}
+        summary[provider] = stats
+    return summary, scenes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score competitor captions against our narration")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scene_ids, providers, grid = load_captions(args.manifest)
+    cache = VectorCache(args.cache)
+    summary, scenes = score(scene_ids, providers, grid, cache)
+    cache.save()
+    elapsed = time.perf_counter() - started
+
+    scoreboard = {
+        "manifest": args.manifest.name,
+        "vectorizer": {"version": VECTORIZER_VERSION, "dimensions": DIMENSIONS},
+        "providers": summary,
+        "scenes": scenes,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(scoreboard, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+
+    pairs = sum(len(scene["similarity"]) for scene in scenes)
+    print(f"📊 Caption scoreboard: {len(scenes)} scenes, {pairs} provider pairs "
+          f"({cache.misses} new captions vectorised) in {elapsed:.2f}s")
+    print("─" * 70)
+    print(f"   {'provider':12} {'similarity':>10}  {'nouns':>8} {'spatial':>8} {'adjectives':>10}")
+    for provider, stats in sorted(summary.items(), key=lambda item: -item[1].get("mean_similarity", 2)):
+        counts = stats["mean_counts"]
+        similarity = f"{stats['mean_similarity']:.3f}" if "mean_similarity" in stats else "—"
+        print(f"   {provider:12} {similarity:>10}  {counts['nouns']:8.1f} {counts['spatial']:8.1f} "
+              f"{counts['adjectives']:10.1f}")
+    print(f"\n💾 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 import os
-import requests
 import json
 from pathlib import Path
 
-# Read API key directly from .env file
+import http_cassette
+import tts_client
+
+http = http_cassette.get_session()
+
+# Read API key from .env file
 try:
-    with open('.env', 'r') as f:
-        for line in f:
-            if line.startswith('ELEVENLABS_API_KEY='):
-                api_key = line.split('=', 1)[1].strip()
-                break
-        else:
-            print("❌ ELEVENLABS_API_KEY not found in .env")
-            exit(1)
+    api_key = tts_client.load_api_key()
+except KeyError:
+    print("❌ ELEVENLABS_API_KEY not found in .env")
+    exit(1)
 except FileNotFoundError:
     print("❌ .env file not found")
     exit(1)
@@ -29,7 +29,7 @@ headers = {
 # Test 1: Check user info
 print("\n1. Testing API key validity...")
 try:
-    response = requests.get("https://api.elevenlabs.io/v1/user", headers=headers)
+    response = http.get("https://api.elevenlabs.io/v1/user", headers=headers)
     if response.status_code == 200:
         user_data = response.json()
         print(f"✅ API Key valid! Hello {user_data.get('name', 'User')}")
@@ -45,7 +45,7 @@ except Exception as e:
 # Test 2: Get available voices
 print("\n2. Fetching available voices...")
 try:
-    response = requests.get("https://api.elevenlabs.io/v1/voices", headers=headers)
+    response = http.get("https://api.elevenlabs.io/v1/voices", headers=headers)
     if response.status_code == 200:
         voices_data = response.json()
         voices = voices_data.get('voices', [])
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Priority and deadline-aware scheduler in front of tts_client.synthesize.
+
+Jobs are submitted with a priority class and optional deadline and come back
+as ``concurrent.futures.Future`` objects. Workers share one rate limit (the
+API key's), and always pick work in this order:
+
+  1. interactive jobs, earliest deadline first
+  2. any job whose deadline is within ``urgent_window`` seconds
+  3. normal jobs, earliest deadline first
+  4. batch jobs, from whichever batch has had the fewest characters served
+
+One worker slot is held back from batch work so an interactive job (say, a
+text fix right before a demo) starts as soon as the rate limit allows, even
+while a long audition batch is running. Jobs still waiting when their
+deadline passes fail with ``DeadlineExceeded`` instead of burning characters.
+
+Each job carries a predicted request time from narration_timing, so
+``eta()`` can tell how long the queue will take to drain.
+"""
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import narration_timing
+import tts_client
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, NORMAL, BATCH)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+@dataclass(order=True)
+class Job:
+    sort_key: tuple
+    text: str = field(compare=False)
+    voice_id: str = field(compare=False)
+    priority: str = field(compare=False)
+    batch: str = field(compare=False)
+    deadline: float = field(compare=False)
+    kwargs: dict = field(compare=False)
+    future: Future = field(compare=False)
+    predicted_latency: float = field(compare=False, default=0.0)
+    submitted_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+class RateLimiter:
+    """Spaces request starts at least ``interval`` seconds apart"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Claim the next slot and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            return slot - now
+
+
+class SynthesisScheduler:
+    def __init__(self, concurrency=2, min_interval=1.5, urgent_window=10.0,
+                 reserved_interactive_slots=1, synthesize=tts_client.synthesize, timing=None):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.urgent_window = urgent_window
+        self.batch_slots = max(1, concurrency - reserved_interactive_slots)
+        self.rate_limiter = RateLimiter(min_interval)
+        self._synthesize = synthesize
+        self._timing = timing or narration_timing.get_timing()
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queues = {INTERACTIVE: [], NORMAL: []}
+        self._batches = {}        # batch name -> heap of jobs
+        self._batch_served = {}   # batch name -> characters started so far
+        self._running_batch = 0
+        self._running = []        # jobs currently in a worker
+        self._closed = False
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"synthesis-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, text, voice_id, voice_settings=None, priority=BATCH,
+               deadline=None, batch="default", **kwargs):
+        """Queue a synthesis job; ``deadline`` is seconds from now"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' (choose from {', '.join(PRIORITIES)})")
+
+        absolute_deadline = time.monotonic() + deadline if deadline is not None else math.inf
+        backend = kwargs.get("backend") or os.getenv("TTS_BACKEND", "elevenlabs")
+        backend_name = getattr(backend, "name", backend)
+        job = Job(
+            sort_key=(absolute_deadline, next(self._seq)),
+            text=text,
+            voice_id=voice_id,
+            priority=priority,
+            batch=batch,
+            deadline=absolute_deadline,
+            kwargs=dict(kwargs, voice_settings=voice_settings),
+            future=Future(),
+            predicted_latency=self._timing.predict_latency(len(text), backend_name),
+        )
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler has been shut down")
+            if priority == BATCH:
+                if not self._batch_active(batch):
+                    # Join at the level of the batches already running, so a
+                    # newcomer shares slots with them instead of starving them
+                    active = [self._batch_served[name] for name in self._batch_served
+                              if self._batch_active(name)]
+                    self._batch_served[batch] = min(active, default=0)
+                heapq.heappush(self._batches.setdefault(batch, []), job)
+            else:
+                heapq.heappush(self._queues[priority], job)
+            self._cond.notify()
+        return job.future
+
+    def _batch_active(self, name):
+        return bool(self._batches.get(name)) or any(
+            job.priority == BATCH and job.batch == name for job in self._running)
+
+    def pending(self):
+        with self._cond:
+            return (sum(len(q) for q in self._queues.values())
+                    + sum(len(q) for q in self._batches.values()))
+
+    def eta(self):
+        """Predicted seconds until every queued and running job has finished"""
+        with self._cond:
+            queues = list(self._queues.values()) + list(self._batches.values())
+            jobs = [job for q in queues for job in q] + self._running
+        return narration_timing.batch_eta([job.predicted_latency for job in jobs],
+                                          self.concurrency, self.min_interval)
+
+    # ── Selection ──────────────────────────────────────────────────────────
+
+    def _expire(self, now):
+        """Fail queued jobs whose deadline has already passed"""
+        queues = list(self._queues.values()) + list(self._batches.values())
+        for queue in queues:
+            while queue and queue[0].deadline < now:
+                job = heapq.heappop(queue)
+                if not job.future.set_running_or_notify_cancel():
+                    continue  # the caller already cancelled it
+                job.future.set_exception(DeadlineExceeded(
+                    f"Job for voice {job.voice_id} missed its deadline before starting"
+                ))
+
+    def _urgent_batch_job(self, now):
+        candidates = [q for q in self._batches.values() if q and q[0].deadline - now <= self.urgent_window]
+        if not candidates:
+            return None
+        return heapq.heappop(min(candidates, key=lambda q: q[0].sort_key))
+
+    def _next_job(self):
+        now = time.monotonic()
+        self._expire(now)
+
+        if self._queues[INTERACTIVE]:
+            return heapq.heappop(self._queues[INTERACTIVE])
+
+        normal = self._queues[NORMAL]
+        urgent_normal = normal and normal[0].deadline - now <= self.urgent_window
+        # Urgent batch work still never takes the slots reserved for interactive jobs
+        if not urgent_normal and self._running_batch < self.batch_slots:
+            job = self._urgent_batch_job(now)
+            if job:
+                return job
+        if normal:
+            return heapq.heappop(normal)
+
+        if self._running_batch >= self.batch_slots:
+            return None
+        waiting = [name for name, q in self._batches.items() if q]
+        if not waiting:
+            return None
+        # Fair share: the batch that has been served the fewest characters goes next
+        name = min(waiting, key=lambda n: self._batch_served[n])
+        return heapq.heappop(self._batches[name])
+
+    # ── Workers ────────────────────────────────────────────────────────────
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._closed and not self.pending():
+                        return
+                    self._cond.wait(timeout=1.0)
+                    job = self._next_job()
+                if job.priority == BATCH:
+                    self._running_batch += 1
+                    self._batch_served[job.batch] += len(job.text)
+                self._running.append(job)
+
+            try:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                time.sleep(self.rate_limiter.reserve())
+                try:
+                    audio = self._synthesize(job.text, job.voice_id, **job.kwargs)
+                except Exception as e:
+                    job.future.set_exception(e)
+                else:
+                    job.future.set_result(audio)
+            finally:
+                with self._cond:
+                    self._running.remove(job)
+                    if job.priority == BATCH:
+                        self._running_batch -= 1
+                    self._cond.notify_all()
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs; workers exit once the queues are empty"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
@@ -0,0 +1,45 @@
+import importlib
+
+import numpy as np
+
+reel = importlib.import_module("build-demo-reel")
+
+
+class CollectingWriter:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, samples):
+        self.parts.append(np.asarray(samples, dtype=np.float32))
+
+    def write_silence(self, seconds):
+        self.write(np.zeros(int(round(seconds * reel.SAMPLE_RATE)), dtype=np.float32))
+
+    def output(self):
+        return np.concatenate(self.parts)
+
+
+def constant_clips(monkeypatch, seconds):
+    """Every clip decodes to `seconds` of a constant 0.5 signal, in CHUNK_FRAMES pieces"""
+    def fake_chunks(path):
+        remaining = int(seconds * reel.SAMPLE_RATE)
+        while remaining > 0:
+            n = min(remaining, reel.CHUNK_FRAMES)
+            yield np.full(n, 0.5, dtype=np.float32)
+            remaining -= n
+    monkeypatch.setattr(reel, "mono_chunks", fake_chunks)
+
+
+def test_crossfade_longer_than_a_chunk_is_click_free(monkeypatch):
+    constant_clips(monkeypatch, seconds=6.0)
+    crossfade = 2.0
+    assert crossfade * reel.SAMPLE_RATE > reel.CHUNK_FRAMES
+    items = [reel.ReelItem(f"scene-{i}", f"scene-{i}.wav", gap=0.0, crossfade=crossfade, gain_db=0.0)
+             for i in range(3)]
+    writer = CollectingWriter()
+    reel.render(items, writer, target_db=None)
+
+    out = writer.output()
+    fade = int(crossfade * reel.SAMPLE_RATE)
+    assert len(out) == 3 * 6 * reel.SAMPLE_RATE - 2 * fade
+    assert np.abs(np.diff(out)).max() < 1e-3
@@ -0,0 +1,58 @@
+import requests
+
+import http_cassette
+import tts_backends
+import tts_client
+import usage_ledger
+
+
+class FakeElevenLabs(requests.adapters.BaseAdapter):
+    """Answers every request with a fixed clip, and counts calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "audio/mpeg"
+        response._content = b"ID3 fake clip"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def fresh_state(monkeypatch, tmp_path, mode):
+    monkeypatch.setenv("TTS_CASSETTE_MODE", mode)
+    monkeypatch.setenv("TTS_CASSETTE_DIR", str(tmp_path / "cassettes"))
+    monkeypatch.setattr(http_cassette, "_session", None)
+    monkeypatch.setattr(tts_backends, "_instances", {})
+    monkeypatch.setattr(usage_ledger, "_ledger", usage_ledger.UsageLedger(str(tmp_path / "ledger.sqlite")))
+
+
+def test_replay_runs_offline_without_credentials(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    # Record once against a fake API, with a real-looking key
+    fresh_state(monkeypatch, tmp_path, http_cassette.RECORD)
+    fake = FakeElevenLabs()
+    http_cassette.get_session().mount("https://", fake)
+    recorded = tts_client.synthesize("The Endurance spins.", "voice-1", api_key="sk-real")
+    assert fake.calls == 1
+
+    # Replay with no .env and no network: a dummy key is enough
+    fresh_state(monkeypatch, tmp_path, http_cassette.REPLAY)
+    assert not (tmp_path / ".env").exists()
+    http_cassette.get_session().mount("https://", FakeElevenLabs())
+    assert tts_client.load_api_key() == http_cassette.REPLAY_API_KEY
+    assert tts_client.synthesize("The Endurance spins.", "voice-1") == recorded
+    assert http_cassette.get_session().get_adapter("https://api.elevenlabs.io").calls == 0
+
+    # Nothing secret lands in the cassette
+    for path in (tmp_path / "cassettes").rglob("*.json"):
+        assert "sk-real" not in path.read_text()
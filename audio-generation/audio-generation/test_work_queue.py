@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+import work_queue
+from work_queue import LeaseLost, WorkQueue
+
+
+def expire(queue, job):
+    """Backdate a job's lease as if its worker had stopped heartbeating"""
+    with sqlite3.connect(queue.path) as conn:
+        conn.execute("UPDATE jobs SET lease_expires = 0 WHERE id = ?", (job["id"],))
+
+
+def status(queue, job_id):
+    with sqlite3.connect(queue.path) as conn:
+        return conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+
+def test_expired_lease_is_taken_over_and_old_owner_cannot_publish(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.sqlite")
+    queue.enqueue("synthesize", {"text": "hello"}, dedupe_key="scene-1")
+    stale = queue.lease("worker-a")
+    expire(queue, stale)
+
+    fresh = queue.lease("worker-b")
+    assert fresh["id"] == stale["id"]
+    assert fresh["attempts"] == 2
+
+    stale_output = tmp_path / "stale.tmp"
+    stale_output.write_bytes(b"stale")
+    final_output = tmp_path / "out" / "scene-1.mp3"
+    with pytest.raises(LeaseLost):
+        queue.complete(stale, temp_output=stale_output, final_output=final_output)
+    assert not final_output.exists()
+    assert status(queue, stale["id"]) == work_queue.LEASED
+
+    fresh_output = tmp_path / "fresh.tmp"
+    fresh_output.write_bytes(b"fresh")
+    queue.complete(fresh, temp_output=fresh_output, final_output=final_output)
+    assert final_output.read_bytes() == b"fresh"
+    assert status(queue, fresh["id"]) == work_queue.DONE
+
+
+def test_abandoned_job_on_last_attempt_fails(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.sqlite")
+    job_id, _ = queue.enqueue("synthesize", {"text": "hello"}, max_attempts=2)
+    for _ in range(2):
+        job = queue.lease("worker-a")
+        assert job["id"] == job_id
+        expire(queue, job)
+
+    assert queue.lease("worker-b") is None
+    assert status(queue, job_id) == work_queue.FAILED
+
+
+def test_failed_job_is_requeued_by_its_dedupe_key(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.sqlite")
+    job_id, _ = queue.enqueue("synthesize", {"text": "hello"}, dedupe_key="scene-1", max_attempts=1)
+    queue.fail(queue.lease("worker-a"), "backend down")
+    assert status(queue, job_id) == work_queue.FAILED
+
+    assert queue.enqueue("synthesize", {"text": "hello"}, dedupe_key="scene-1") == (job_id, "requeued")
+    job = queue.lease("worker-b")
+    assert job["id"] == job_id
+    assert job["attempts"] == 1
+    assert queue.enqueue("synthesize", {"text": "hello"}, dedupe_key="scene-1") == (job_id, work_queue.LEASED)
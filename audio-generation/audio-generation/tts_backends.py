@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Synthesis backends that tts_client dispatches through.
+
+``elevenlabs`` is the premium, networked engine used for final renders.
+``local`` drives espeak-ng on the CPU: no network, no per-character cost,
+and a few milliseconds per line, which is plenty for draft renders, timing
+work and CI. Pick one with ``get_backend(name)`` or the TTS_BACKEND env var.
+"""
+import os
+import shutil
+import subprocess
+
+import http_cassette
+
+API_BASE = "https://api.elevenlabs.io/v1"
+DEFAULT_MODEL_ID = "eleven_monolingual_v1"
+
+
+class SynthesisBackend:
+    """Interface every backend implements"""
+
+    name = "base"
+    audio_format = "mp3"
+
+    def synthesize(self, text, voice_id, voice_settings, model_id=DEFAULT_MODEL_ID):
+        raise NotImplementedError
+
+    def key_id(self):
+        """Credential used for this backend, if any (recorded in the ledger)"""
+        return None
+
+
+class ElevenLabsBackend(SynthesisBackend):
+    name = "elevenlabs"
+    audio_format = "mp3"
+
+    def __init__(self, api_key=None, timeout=30):
+        if api_key is None:
+            # Imported lazily so the local backend works without a .env
+            from tts_client import load_api_key
+            api_key = load_api_key()
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def synthesize(self, text, voice_id, voice_settings, model_id=DEFAULT_MODEL_ID):
+        response = http_cassette.get_session().post(
+            f"{API_BASE}/text-to-speech/{voice_id}",
+            json={
+                "text": text,
+                "model_id": model_id,
+                "voice_settings": voice_settings
+            },
+            headers={
+                "xi-api-key": self.api_key,
+                "Content-Type": "application/json"
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.content
+
+    def key_id(self):
+        return self.api_key
+
+
+# Rough stand-ins for our ElevenLabs voices so drafts keep speaker contrast
+LOCAL_VOICES = {
+    "TxGEqnHWrfWFTfGW9XjX": "en-us+m3",  # Josh
+    "XB0fDUnXU5powFXDhCwa": "en-us+f3",  # Rachel
+    "N2lVS1w4EtoT3dr4eOWO": "en-gb+m1",  # Callum
+    "VR6AewLTigWG4xSOukaG": "en-us+m7",  # Arnold
+    "AZnzlk1XvdvUeBnXmlld": "en-us+f2",  # Domi
+    "pNInz6obpgDQGcFmaJgB": "en-us+m2",  # Adam
+}
+
+
+class LocalBackend(SynthesisBackend):
+    """Offline espeak-ng engine producing 22 kHz mono WAV"""
+
+    name = "local"
+    audio_format = "wav"
+
+    def __init__(self, words_per_minute=165, default_voice="en-us"):
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.binary:
+            raise RuntimeError("Local backend needs espeak-ng (apt install espeak-ng / brew install espeak-ng)")
+        self.words_per_minute = words_per_minute
+        self.default_voice = default_voice
+
+    def synthesize(self, text, voice_id, voice_settings, model_id=None):
+        voice = LOCAL_VOICES.get(voice_id, self.default_voice)
+        result = subprocess.run(
+            [self.binary, "--stdout", "-v", voice, "-s", str(self.words_per_minute)],
+            input=text.encode(),
+            capture_output=True,
+            check=True
+        )
+        return result.stdout
+
+
+BACKENDS = {
+    ElevenLabsBackend.name: ElevenLabsBackend,
+    LocalBackend.name: LocalBackend,
+}
+
+_instances = {}
+
+
+def get_backend(name=None, **kwargs):
+    """Return a shared backend instance by name (default: $TTS_BACKEND or elevenlabs)"""
+    name = name or os.getenv("TTS_BACKEND", ElevenLabsBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown synthesis backend '{name}' (choose from {', '.join(BACKENDS)})")
+    if kwargs:
+        return BACKENDS[name](**kwargs)
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
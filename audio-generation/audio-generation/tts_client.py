@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Shared synthesis helpers for the audio-generation scripts."""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import http_cassette
+import tts_backends
+import usage_ledger
+from tts_backends import DEFAULT_MODEL_ID
+
+DEFAULT_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.8,
+    "style": 0.7,
+    "use_speaker_boost": True
+}
+
+
+def load_api_key(env_path=".env"):
+    """Read ELEVENLABS_API_KEY from a .env file (a placeholder when replaying cassettes)"""
+    if os.path.exists(env_path):
+        with open(env_path, 'r') as f:
+            for line in f:
+                if line.startswith('ELEVENLABS_API_KEY='):
+                    return line.split('=', 1)[1].strip()
+    replay_key = http_cassette.replay_api_key()
+    if replay_key:
+        return replay_key
+    if not os.path.exists(env_path):
+        raise FileNotFoundError(f"{env_path} file not found")
+    raise KeyError(f"ELEVENLABS_API_KEY not found in {env_path}")
+
+
+def cache_key(text, voice_id, voice_settings, model_id, backend_name="elevenlabs"):
+    blob = json.dumps([text, voice_id, voice_settings, model_id, backend_name], sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def synthesize(text, voice_id, voice_settings=None, model_id=DEFAULT_MODEL_ID,
+               api_key=None, timeout=30, scene_id=None, cache_dir=None, backend=None):
+    """Render text and return the audio bytes.
+
+    ``backend`` is a backend name or instance from tts_backends; by default
+    this is ElevenLabs (or whatever $TTS_BACKEND names). Every call, including
+    cache hits, is appended to the usage ledger. Pass ``cache_dir`` to reuse
+    earlier renders of identical requests.
+    """
+    if backend is None or isinstance(backend, str):
+        name = backend or os.getenv("TTS_BACKEND", tts_backends.ElevenLabsBackend.name)
+        if name == tts_backends.ElevenLabsBackend.name and api_key is not None:
+            backend = tts_backends.ElevenLabsBackend(api_key=api_key, timeout=timeout)
+        else:
+            backend = tts_backends.get_backend(name)
+
+    # Drop our own bookkeeping keys (e.g. "description") before sending
+    settings = dict(voice_settings or DEFAULT_VOICE_SETTINGS)
+    settings.pop("description", None)
+
+    def record(audio, cache_hit=False):
+        usage_ledger.get_ledger().record(
+            voice_id, len(text), len(audio), (time.perf_counter() - started) * 1000,
+            cache_hit=cache_hit, scene_id=scene_id, api_key=backend.key_id(),
+            backend=backend.name
+        )
+
+    started = time.perf_counter()
+    cached_file = None
+    if cache_dir:
+        key = cache_key(text, voice_id, settings, model_id, backend.name)
+        cached_file = Path(cache_dir) / f"{key}.{backend.audio_format}"
+        if cached_file.exists():
+            audio = cached_file.read_bytes()
+            record(audio, cache_hit=True)
+            return audio
+
+    audio = backend.synthesize(text, voice_id, settings, model_id)
+    record(audio)
+    if cached_file:
+        save_audio(audio, cached_file)
+    return audio
+
+
+def save_audio(audio, output_path):
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(audio)
+    return output_path
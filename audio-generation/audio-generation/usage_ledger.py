@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Local SQLite ledger of every synthesis call.
+
+``record()`` only enqueues the row; a background thread batches inserts so
+the synthesis hot path never waits on disk. Cache hits are recorded too so
+we can see how many characters the cache saved us.
+
+Usage:
+    python usage_ledger.py report            # per scene / voice / run
+    python usage_ledger.py report --by voice
+"""
+import argparse
+import atexit
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+LEDGER_PATH = os.getenv("TTS_LEDGER_PATH", "usage-ledger.sqlite")
+
+# ElevenLabs bills per character; override to match the current plan.
+# Local-backend drafts are free and never count towards billed characters.
+COST_PER_1K_CHARS = float(os.getenv("TTS_COST_PER_1K_CHARS", "0.30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS synthesis_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    run_id TEXT NOT NULL,
+    key_id TEXT,
+    backend TEXT,
+    voice_id TEXT,
+    scene_id TEXT,
+    experiment TEXT,
+    characters INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    latency_ms REAL NOT NULL,
+    cache_hit INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_calls_scene ON synthesis_calls(scene_id);
+CREATE INDEX IF NOT EXISTS idx_calls_voice ON synthesis_calls(voice_id);
+CREATE INDEX IF NOT EXISTS idx_calls_run ON synthesis_calls(run_id);
+"""
+
+COLUMNS = ("timestamp", "run_id", "key_id", "backend", "voice_id", "scene_id",
+           "experiment", "characters", "bytes", "latency_ms", "cache_hit")
+
+# One id per process unless a script names its run explicitly
+_context = {
+    "run_id": time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6],
+    "experiment": None,
+}
+
+
+def set_context(run_id=None, experiment=None):
+    """Tag every following record with a run and/or experiment name"""
+    if run_id:
+        _context["run_id"] = run_id
+    if experiment:
+        _context["experiment"] = experiment
+
+
+def key_fingerprint(api_key):
+    """Short, non-reversible id so the raw key never lands on disk"""
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+# Queued by close() to wake the writer thread immediately
+_STOP = object()
+
+# Several work_queue workers on one host share the ledger file, so a write can
+# hit "database is locked"; retry a batch this many times before dropping it
+WRITE_ATTEMPTS = 5
+RETRY_DELAY = 0.5
+
+
+class UsageLedger:
+    def __init__(self, path=LEDGER_PATH, batch_size=50, flush_interval=2.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._flushed = threading.Condition()
+        self._written = 0
+        self._enqueued = 0
+
+        with sqlite3.connect(self.path) as conn:
+            conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="usage-ledger", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def record(self, voice_id, characters, audio_bytes, latency_ms, cache_hit=False,
+               scene_id=None, experiment=None, api_key=None, backend="elevenlabs"):
+        row = (
+            time.time(),
+            _context["run_id"],
+            key_fingerprint(api_key),
+            backend,
+            voice_id,
+            scene_id,
+            experiment or _context["experiment"],
+            characters,
+            audio_bytes,
+            round(latency_ms, 2),
+            int(cache_hit),
+        )
+        # record() runs on scheduler worker threads, so count under the lock
+        with self._flushed:
+            self._enqueued += 1
+        self._pending.put(row)
+
+    def _drain(self, first=None):
+        """Up to batch_size rows; the second value is True if the stop sentinel was seen"""
+        batch = [] if first is None else [first]
+        while len(batch) < self.batch_size:
+            try:
+                row = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    def _write_batch(self, conn, insert, batch):
+        """Insert one batch, retrying transient SQLite errors with backoff"""
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                with conn:
+                    conn.executemany(insert, batch)
+                return
+            except sqlite3.Error as e:
+                if attempt == WRITE_ATTEMPTS:
+                    print(f"❌ Usage ledger dropped {len(batch)} rows after {attempt} attempts: {e}")
+                    return
+                print(f"⚠️  Usage ledger write failed ({e}), retrying")
+                time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        insert = f"INSERT INTO synthesis_calls ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+        try:
+            stopping = False
+            while not stopping:
+                try:
+                    first = self._pending.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                if first is _STOP:
+                    break
+                batch, stopping = self._drain(first)
+                self._write_batch(conn, insert, batch)
+                # Dropped rows count too, so flush() never waits on them
+                with self._flushed:
+                    self._written += len(batch)
+                    self._flushed.notify_all()
+        finally:
+            conn.close()
+
+    def flush(self, timeout=10):
+        """Block until everything recorded so far is on disk"""
+        with self._flushed:
+            target = self._enqueued
+            self._flushed.wait_for(lambda: self._written >= target, timeout=timeout)
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        # Rows are written in FIFO order, so everything recorded so far lands before the sentinel
+        self._pending.put(_STOP)
+        self._writer.join(timeout=10)
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+        return _ledger
+
+
+# ── Aggregate queries ─────────────────────────────────────────────────────
+
+GROUPINGS = {
+    "scene": "COALESCE(scene_id, experiment, '(none)')",
+    "voice": "voice_id",
+    "run": "run_id",
+}
+
+
+def cost_by(group, path=LEDGER_PATH):
+    """Billed characters, estimated cost and latency per scene/voice/run"""
+    column = GROUPINGS[group]
+    sql = f"""
+        SELECT {column} AS name,
+               COUNT(*) AS calls,
+               SUM(CASE WHEN cache_hit OR backend = 'local' THEN 0 ELSE characters END) AS billed_chars,
+               SUM(bytes) AS bytes,
+               AVG(CASE WHEN cache_hit THEN NULL ELSE latency_ms END) AS avg_latency_ms,
+               SUM(cache_hit) AS cache_hits
+        FROM synthesis_calls
+        GROUP BY name
+        ORDER BY billed_chars DESC
+    """
+    with sqlite3.connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = [dict(row) for row in conn.execute(sql)]
+    for row in rows:
+        row["cost_usd"] = round(row["billed_chars"] / 1000 * COST_PER_1K_CHARS, 4)
+    return rows
+
+
+def cache_savings(path=LEDGER_PATH):
+    sql = """
+        SELECT SUM(cache_hit) AS hits,
+               COUNT(*) AS calls,
+               COALESCE(SUM(CASE WHEN cache_hit AND backend != 'local' THEN characters ELSE 0 END), 0) AS saved_chars
+        FROM synthesis_calls
+    """
+    with sqlite3.connect(path) as conn:
+        hits, calls, saved_chars = conn.execute(sql).fetchone()
+    return {
+        "calls": calls or 0,
+        "cache_hits": hits or 0,
+        "hit_rate": round((hits or 0) / calls, 3) if calls else 0.0,
+        "saved_chars": saved_chars,
+        "saved_usd": round(saved_chars / 1000 * COST_PER_1K_CHARS, 4),
+    }
+
+
+def print_report(groups, path=LEDGER_PATH):
+    for group in groups:
+        print(f"\n📊 Cost per {group}")
+        print("─" * 78)
+        for row in cost_by(group, path):
+            latency = row["avg_latency_ms"] or 0
+            print(f"   {str(row['name'])[:28]:28} {row['calls']:5} calls "
+                  f"{row['billed_chars']:8} chars  ${row['cost_usd']:<8} {latency:7.0f}ms avg")
+
+    savings = cache_savings(path)
+    print("\n💾 Cache savings")
+    print("─" * 78)
+    print(f"   {savings['cache_hits']}/{savings['calls']} calls served from cache "
+          f"({savings['hit_rate']:.0%}), {savings['saved_chars']} chars / ${savings['saved_usd']} saved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesis usage ledger")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Print cost aggregates")
+    report.add_argument("--by", choices=sorted(GROUPINGS), action="append")
+    report.add_argument("--ledger", default=LEDGER_PATH)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.ledger):
+        print(f"❌ No ledger at {args.ledger}")
+        exit(1)
+
+    print_report(args.by or ["scene", "voice", "run"], args.ledger)
+
+
+if __name__ == "__main__":
+    main()
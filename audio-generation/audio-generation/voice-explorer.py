@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
-import requests
 import json
 
-with open('.env', 'r') as f:
-    for line in f:
-        if line.startswith('ELEVENLABS_API_KEY='):
-            api_key = line.split('=', 1)[1].strip()
-            break
+import http_cassette
+import tts_client
+
+http = http_cassette.get_session()
+
+api_key = tts_client.load_api_key()
 
 headers = {"xi-api-key": api_key}
-response = requests.get("https://api.elevenlabs.io/v1/voices", headers=headers)
+response = http.get("https://api.elevenlabs.io/v1/voices", headers=headers)
 
 if response.status_code == 200:
     voices = response.json()['voices']
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Shared job queue so several machines can work through one generation batch.
+
+The queue is a single SQLite file; put it on storage every render node can
+reach (a shared volume, or a local disk when running several workers on one
+host). Workers lease a job for ``lease_seconds`` and keep it alive with
+heartbeats; a worker that dies simply lets its lease expire and the job
+goes back to the pool.
+
+Outputs are published exactly once: a worker renders into a temp file,
+then, inside the same write transaction that marks the job done, checks it
+still holds the lease and renames the file into place. A worker whose lease
+was taken over can finish rendering but will never publish.
+
+Usage:
+    python generate-all-scenes.py --enqueue jobs.sqlite     # fill the queue
+    python work_queue.py worker --queue jobs.sqlite         # on each node
+    python work_queue.py status --queue jobs.sqlite
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    payload TEXT NOT NULL,
+    output TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority, id);
+"""
+
+
+class LeaseLost(Exception):
+    """Another worker now owns the job; stop and do not publish"""
+
+
+class WorkQueue:
+    def __init__(self, path):
+        self.path = str(path)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self):
+        """BEGIN IMMEDIATE so the read-then-write below is atomic across processes"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def enqueue(self, kind, payload, output=None, dedupe_key=None, priority=0,
+                max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Add a job; returns (job id, status).
+
+        A ``dedupe_key`` that already has a job returns that job's id and
+        status ('queued', 'leased' or 'done'), except that a failed job is
+        reset and queued again with fresh attempts.
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            row = None
+            if dedupe_key is not None:
+                row = conn.execute("SELECT id, status FROM jobs WHERE dedupe_key = ?", (dedupe_key,)).fetchone()
+            if row is None:
+                cursor = conn.execute(
+                    """INSERT INTO jobs
+                       (kind, dedupe_key, payload, output, priority, max_attempts, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (kind, dedupe_key, json.dumps(payload), output, priority, max_attempts, now, now)
+                )
+                result = (cursor.lastrowid, QUEUED)
+            elif row["status"] == FAILED:
+                conn.execute(
+                    """UPDATE jobs SET status = 'queued', payload = ?, output = ?, priority = ?,
+                       max_attempts = ?, attempts = 0, error = NULL, result = NULL, updated_at = ?
+                       WHERE id = ?""",
+                    (json.dumps(payload), output, priority, max_attempts, now, row["id"])
+                )
+                result = (row["id"], "requeued")
+            else:
+                result = (row["id"], row["status"])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return result
+
+    def lease(self, worker_id, kinds=None, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Claim the next ready job (or one whose lease expired); None if idle"""
+        now = time.time()
+        kind_filter = ""
+        params = [now]
+        if kinds:
+            kind_filter = f"AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        conn = self._transaction()
+        try:
+            # A worker that died mid-job never called fail(); retire jobs that
+            # have used up their attempts instead of handing them out again
+            conn.execute(
+                """UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_token = NULL,
+                   lease_expires = NULL, error = COALESCE(error, 'Lease expired on final attempt'),
+                   updated_at = ?
+                   WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts""",
+                (now, now)
+            )
+            row = conn.execute(
+                f"""SELECT * FROM jobs
+                    WHERE (status = 'queued'
+                           OR (status = 'leased' AND lease_expires < ? AND attempts < max_attempts))
+                    {kind_filter}
+                    ORDER BY priority DESC, id
+                    LIMIT 1""",
+                params
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            token = uuid.uuid4().hex
+            conn.execute(
+                """UPDATE jobs SET status = 'leased', lease_owner = ?, lease_token = ?,
+                   lease_expires = ?, attempts = attempts + 1, updated_at = ?
+                   WHERE id = ?""",
+                (worker_id, token, now + lease_seconds, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["lease_token"] = token
+        job["attempts"] += 1
+        return job
+
+    def heartbeat(self, job, lease_seconds=DEFAULT_LEASE_SECONDS):
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """UPDATE jobs SET lease_expires = ?, updated_at = ?
+                   WHERE id = ? AND status = 'leased' AND lease_token = ?""",
+                (now + lease_seconds, now, job["id"], job["lease_token"])
+            )
+        if not cursor.rowcount:
+            raise LeaseLost(f"Lost lease on job {job['id']}")
+
+    def complete(self, job, result=None, temp_output=None, final_output=None):
+        """Mark the job done and publish its output, only if we still hold the lease"""
+        conn = self._transaction()
+        try:
+            row = conn.execute(
+                "SELECT status, lease_token FROM jobs WHERE id = ?", (job["id"],)
+            ).fetchone()
+            if row["status"] != LEASED or row["lease_token"] != job["lease_token"]:
+                raise LeaseLost(f"Lost lease on job {job['id']} before publishing")
+            if temp_output is not None:
+                Path(final_output).parent.mkdir(parents=True, exist_ok=True)
+                os.replace(temp_output, final_output)
+            conn.execute(
+                """UPDATE jobs SET status = 'done', result = ?, lease_token = NULL,
+                   lease_expires = NULL, error = NULL, updated_at = ? WHERE id = ?""",
+                (json.dumps(result), time.time(), job["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def fail(self, job, error):
+        """Requeue the job, or park it as failed once it is out of attempts"""
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE jobs SET
+                       status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                       lease_owner = NULL, lease_token = NULL, lease_expires = NULL,
+                       error = ?, updated_at = ?
+                   WHERE id = ? AND lease_token = ?""",
+                (str(error), time.time(), job["id"], job["lease_token"])
+            )
+
+    def counts(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status")
+            return [(row["kind"], row["status"], row["n"]) for row in rows]
+
+
+class Heartbeat:
+    """Renews a lease in the background while a job runs"""
+
+    def __init__(self, queue, job, lease_seconds):
+        self.queue = queue
+        self.job = job
+        self.lease_seconds = lease_seconds
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.queue.heartbeat(self.job, self.lease_seconds)
+            except LeaseLost:
+                self.lost.set()
+                return
+            except sqlite3.OperationalError as e:
+                # Busy database; the next beat will retry well within the lease
+                print(f"   ⚠️  Heartbeat for job {self.job['id']} failed: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+# ── Job handlers ──────────────────────────────────────────────────────────
+# Each handler renders into ``temp_path`` and returns a JSON-able result.
+
+def handle_synthesize(payload, temp_path):
+    import tts_client
+    audio = tts_client.synthesize(
+        payload["text"], payload["voice_id"], payload.get("voice_settings"),
+        scene_id=payload.get("scene_id"), backend=payload.get("backend"),
+        cache_dir=payload.get("cache_dir")
+    )
+    Path(temp_path).write_bytes(audio)
+    return {"bytes": len(audio), "characters": len(payload["text"])}
+
+
+def handle_transcode(payload, temp_path):
+    import audio_decode
+    subprocess.run(
+        [audio_decode.ffmpeg_binary(), "-v", "error", "-nostdin", "-y", "-i", payload["input"],
+         *payload.get("args", []), "-f", payload["format"], str(temp_path)],
+        check=True
+    )
+    return {"bytes": Path(temp_path).stat().st_size}
+
+
+def handle_peaks(payload, temp_path):
+    import importlib
+    import audio_decode
+    peaks = importlib.import_module("generate-waveform-peaks")
+    samples = audio_decode.decode_pcm(payload["input"], peaks.SAMPLE_RATE)
+    Path(temp_path).write_bytes(peaks.encode_peaks(samples, peaks.SAMPLE_RATE))
+    return {"duration": round(len(samples) / peaks.SAMPLE_RATE, 3)}
+
+
+HANDLERS = {
+    "synthesize": handle_synthesize,
+    "transcode": handle_transcode,
+    "peaks": handle_peaks,
+}
+
+
+def run_job(queue, job, output_root, lease_seconds):
+    final_output = Path(output_root) / job["output"]
+    temp_output = final_output.with_name(f".{final_output.name}.{job['lease_token']}.tmp")
+    temp_output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with Heartbeat(queue, job, lease_seconds) as heartbeat:
+            result = HANDLERS[job["kind"]](job["payload"], temp_output)
+        if heartbeat.lost.is_set():
+            raise LeaseLost(f"Lost lease on job {job['id']} while running")
+        queue.complete(job, result, temp_output, final_output)
+        return result
+    finally:
+        if temp_output.exists():
+            temp_output.unlink()
+
+
+def run_worker(queue, worker_id, output_root, kinds=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+               idle_exit=False, poll_interval=2.0):
+    done = 0
+    while True:
+        job = queue.lease(worker_id, kinds, lease_seconds)
+        if job is None:
+            if idle_exit:
+                return done
+            time.sleep(poll_interval)
+            continue
+
+        print(f"🔧 [{worker_id}] job {job['id']} {job['kind']} → {job['output']} (attempt {job['attempts']})")
+        try:
+            run_job(queue, job, output_root, lease_seconds)
+        except LeaseLost as e:
+            print(f"   ⚠️  {e}; leaving it to the new owner")
+        except Exception as e:
+            print(f"   ❌ Job {job['id']} failed: {e}")
+            queue.fail(job, e)
+        else:
+            done += 1
+            print(f"   ✅ Published {job['output']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed generation work queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    worker = sub.add_parser("worker", help="Pull and run jobs until stopped")
+    worker.add_argument("--queue", required=True)
+    worker.add_argument("--output-root", default=".", help="Shared directory job outputs are relative to")
+    worker.add_argument("--kind", action="append", choices=sorted(HANDLERS), help="Only run these job kinds")
+    worker.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS)
+    worker.add_argument("--id", default=f"{socket.gethostname()}-{os.getpid()}")
+    worker.add_argument("--exit-when-idle", action="store_true")
+
+    status = sub.add_parser("status", help="Show job counts")
+    status.add_argument("--queue", required=True)
+
+    args = parser.parse_args()
+    queue = WorkQueue(args.queue)
+
+    if args.command == "status":
+        print("📋 Queue status")
+        print("─" * 50)
+        for kind, state, count in queue.counts():
+            print(f"   {kind:12} {state:8} {count:5}")
+        return
+
+    print(f"🚀 Worker {args.id} on {args.queue}")
+    print("─" * 50)
+    done = run_worker(queue, args.id, args.output_root, args.kind, args.lease, args.exit_when_idle)
+    print(f"\n🎉 Worker {args.id} finished {done} jobs")
+
+
+if __name__ == "__main__":
+    main()
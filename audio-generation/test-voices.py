@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 import os
-import requests
+import sys
 import json
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Shared helpers live next to the other generation scripts
+sys.path.insert(0, str(Path(__file__).parent / "audio-generation"))
+import http_cassette
+import tts_client
+import usage_ledger
+
+http = http_cassette.get_session()
+
 load_dotenv()
+usage_ledger.set_context(experiment="test-voices")
 
 class ElevenLabsTester:
     def __init__(self):
-        self.api_key = os.getenv('ELEVENLABS_API_KEY')
+        self.api_key = os.getenv('ELEVENLABS_API_KEY') or http_cassette.replay_api_key()
         self.base_url = "https://api.elevenlabs.io/v1"
         self.headers = {
             "xi-api-key": self.api_key,
@@ -25,7 +34,7 @@ class ElevenLabsTester:
     def get_voices(self):
         """Fetch available voices from ElevenLabs"""
         try:
-            response = requests.get(f"{self.base_url}/voices", headers=self.headers)
+            response = http.get(f"{self.base_url}/voices", headers=self.headers)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -34,27 +43,13 @@ class ElevenLabsTester:
 
     def generate_voice_test(self, voice_id, voice_name, text, output_path):
         """Generate test audio for a specific voice"""
-        url = f"{self.base_url}/text-to-speech/{voice_id}"
-        
-        payload = {
-            "text": text,
-            "model_id": "eleven_monolingual_v1",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.8,
-                "style": 0.7,
-                "use_speaker_boost": True
-            }
-        }
-
         try:
             print(f"🎙️  Generating test for {voice_name}...")
-            response = requests.post(url, json=payload, headers=self.headers)
-            response.raise_for_status()
+            audio = tts_client.synthesize(text, voice_id, api_key=self.api_key)
             
             # Save as WAV file
             with open(output_path, 'wb') as f:
-                f.write(response.content)
+                f.write(audio)
             
             print(f"✅ Saved: {output_path}")
             return True